@@ -0,0 +1,41 @@
+# الوصول إلى فئات المكتبة بدون تحميلها مسبقًا، مثال: from Projects import Book
+# يتم تحميل الوحدة الفرعية التي تعرّف الاسم عند أول استخدام له فقط (دالة __getattr__ على مستوى الوحدة، PEP 562)
+# لذلك استيراد الحزمة نفسها لا يكلف شيئًا، و from Projects import Book يحمل items.py فقط
+# والمكتبات الأثقل (csv و json و sqlite3 و multiprocessing ...) يتم استيرادها داخل الدوال التي تستخدمها
+#
+# لا يوجد اسم هنا يطابق اسم وحدة فرعية، فنتيجة from Projects import X لا تعتمد على ترتيب الاستيراد:
+# Projects.Library هي دائمًا الوحدة (Library.py، واجهة تجمع كل الفئات)، والفئة Library يتم استيرادها
+# من from Projects.catalog import Library (أو from Projects.Library import Library)
+from importlib import import_module
+
+_MODULES = {
+    ".catalog": ("CatalogView", "CatalogSnapshot"),
+    ".items": ("Item", "Book", "EBook", "BookTable", "LibraryItem", "RenderCache", "BOOK_FIELDS", "book_record"),
+    ".circulation": ("Branch", "Person", "Customer", "BillingSystem", "Loan", "LoanTracker",
+                     "AsyncCirculationDesk"),
+    ".reports": ("LibraryManager", "ReportRenderer"),
+    ".snapshot": ("LibrarySnapshot",),
+    ".search": ("CatalogSearchIndex",),
+    ".importer": ("import_catalog",),
+    ".sharding": ("ShardedLibrary",),
+    ".storage": ("CirculationStore", "InMemoryCirculationStore", "SQLiteCirculationStore"),
+    ".recommendations": ("Recommender",),
+    ".availability": ("AvailabilityIndex",),
+    ".events": ("EventLog", "MaterializedView", "LoansPerBranch", "FinesPerDay", "TopTitles", "BookBorrowed",
+                "BookReturned", "FinePaid", "CopyAdded", "CopyRemoved"),
+    ".instrumentation": ("Metrics", "metrics"),
+}
+_LAZY = {name: module for module, names in _MODULES.items() for name in names}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
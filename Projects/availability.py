@@ -0,0 +1,91 @@
+# إيجاد أقرب الفروع التي يتوفر فيها كتاب
+from collections import namedtuple
+import heapq
+import math
+import threading
+
+# عقدة في شجرة k-d لإحداثيات الفروع
+KDNode = namedtuple("KDNode", ["point", "branch", "axis", "left", "right"])
+
+# فئة AvailabilityIndex تربط كل ISBN بالفروع التي تملك نسخًا منه، مع شجرة k-d لإحداثيات الفروع
+# للإجابة عن سؤال "ما أقرب فرع للعميل يوجد فيه الكتاب؟" بدون المرور على كل الفروع وكتبها
+# يتم تحديث التوفر تدريجيًا من Branch.add_book و Branch.remove_book، والشجرة يعاد بناؤها
+# عند إضافة فرع جديد فقط (المسافة إقليدية على الإحداثيات)
+class AvailabilityIndex:
+    # إذا كان عدد الفروع التي تملك الكتاب أقل من هذا الحد يتم فحصها مباشرة بدلًا من البحث في الشجرة
+    scan_limit = 32
+
+    def __init__(self, branches=()):
+        self._holders = {}  # ISBN -> {الفرع: عدد النسخ}
+        self._branches = set()  # الفروع المسجلة بـ add_branch
+        self._tree = None
+        self._lock = threading.Lock()
+        for branch in branches:
+            self.add_branch(branch)
+
+    # إضافة فرع مع مخزونه الحالي
+    def add_branch(self, branch):
+        with self._lock:
+            if branch in self._branches:
+                return
+            self._branches.add(branch)
+            for isbn, copies in branch.books.items():
+                self._holders.setdefault(isbn, {})[branch] = copies
+            located = [branch for branch in self._branches if branch.coordinates is not None]
+            self._tree = self._build(located, 0)
+
+    def _build(self, branches, depth):
+        if not branches:
+            return None
+        axis = depth % 2
+        branches = sorted(branches, key=lambda branch: branch.coordinates[axis])
+        middle = len(branches) // 2
+        return KDNode(branches[middle].coordinates, branches[middle], axis,
+                      self._build(branches[:middle], depth + 1), self._build(branches[middle + 1:], depth + 1))
+
+    # تحديث عدد النسخ في فرع (يتم تجاهل الفروع غير المسجلة حتى تكون النتائج نفسها
+    # سواء تم البحث بالمرور على الفروع أو في الشجرة)
+    def update(self, branch, isbn, delta):
+        with self._lock:
+            if branch not in self._branches:
+                return
+            holders = self._holders.setdefault(isbn, {})
+            copies = holders.get(branch, 0) + delta
+            if copies > 0:
+                holders[branch] = copies
+            else:
+                holders.pop(branch, None)
+                if not holders:
+                    del self._holders[isbn]
+
+    # الفروع التي تملك نسخة من الكتاب وعدد النسخ في كل منها
+    def branches_with(self, isbn):
+        return dict(self._holders.get(isbn, {}))
+
+    # أقرب k فروع للنقطة point تملك نسخة متاحة من الكتاب [(المسافة، الفرع)]
+    def nearest(self, isbn, point, k=1):
+        with self._lock:
+            holders = self._holders.get(isbn, {})
+            if len(holders) <= self.scan_limit:
+                found = [(math.dist(point, branch.coordinates), branch)
+                         for branch in holders if branch.coordinates is not None]
+                return heapq.nsmallest(k, found, key=lambda item: item[0])
+            best = []  # كومة عظمى (بإشارة سالبة) لأفضل k فروع حتى الآن
+            self._search(self._tree, point, holders, k, best)
+            return sorted(((-distance, branch) for distance, _, branch in best), key=lambda item: item[0])
+
+    def _search(self, node, point, holders, k, best):
+        if node is None:
+            return
+        if node.branch in holders:
+            distance = math.dist(point, node.point)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, id(node.branch), node.branch))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, id(node.branch), node.branch))
+        difference = point[node.axis] - node.point[node.axis]
+        near, far = (node.left, node.right) if difference < 0 else (node.right, node.left)
+        self._search(near, point, holders, k, best)
+        # البحث في الجانب الآخر فقط إذا كان من الممكن أن يحتوي على فرع أقرب
+        if len(best) < k or abs(difference) < -best[0][0]:
+            self._search(far, point, holders, k, best)
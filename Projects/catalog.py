@@ -0,0 +1,341 @@
+# الكتالوج: فئة Library وفهارسها، والعروض واللقطات الثابتة لكتبها
+from collections import Counter, namedtuple
+from collections.abc import Sequence
+from itertools import islice
+from types import MethodType
+import threading
+
+from .search import CatalogSearchIndex
+from .sortedkeys import SortedKeys
+
+# دالة يمكن استدعاؤها من الفئة نفسها أو من كائن منها:
+# Library.add_book(book) تعمل على المكتبة الافتراضية المشتركة (خصائص الفئة)
+# و library.add_book(book) تعمل على المكتبة الخاصة بالكائن library = Library()
+class scopedmethod:
+    def __init__(self, function):
+        self.function = function
+
+    def __get__(self, instance, owner):
+        return MethodType(self.function, owner if instance is None else instance)
+
+# فئة CatalogView تمثل عرضًا ثابتًا للقراءة فقط لأول length عنصر من قائمة
+# الإضافة إلى نهاية القائمة لا تغير العرض، لذلك يتم إنشاؤه بدون نسخ القائمة
+class CatalogView(Sequence):
+    __slots__ = ("_items", "_length")
+
+    def __init__(self, items, length):
+        self._items = items
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("catalog view index out of range")
+        return self._items[index]
+
+    def __iter__(self):
+        return islice(self._items, self._length)
+
+    def __repr__(self):
+        return f"CatalogView({self._length} items)"
+
+# لقطة متسقة من كتب المكتبة وفروعها
+CatalogSnapshot = namedtuple("CatalogSnapshot", ["books", "branches"])
+
+# التحقق من مطابقة الكتاب للتصفية حسب النوع والفئة والمؤلف
+def _matches(book, kind, category, author):
+    return ((kind is None or type(book).__name__ == kind) and
+            (category is None or book.category == category) and
+            (author is None or book.author == author))
+
+# تعريف فئة Library تمثل مكتبة
+# يمكن استخدام الفئة مباشرة (مكتبة واحدة مشتركة) أو إنشاء عدة مكتبات مستقلة منها
+class Library:
+    # قائمة لتخزين الكتب والفروع في المكتبة
+    _books = []
+    _branches = []
+    # فهارس للبحث السريع عن الكتب برقم ISBN والمؤلف والفئة
+    _books_by_isbn = {}
+    _books_by_author = {}
+    _books_by_category = {}
+    # فهرس مرتب بالعناوين (العنوان، ISBN) للبحث ببادئة العنوان
+    _titles = SortedKeys()
+    # فهرس مرتب بالمؤلفين (المؤلف، العنوان، ISBN) للترتيب حسب المؤلف
+    _authors = SortedKeys()
+    # فهارس مرتبة لكل قيمة تصفية: (الترتيب، التصفية، القيمة) -> SortedKeys بنفس مفاتيح _titles أو _authors
+    # مثال: ("title", "category", "رواية") يحتوي على كتب هذه الفئة مرتبة حسب العنوان
+    # (كتب المؤلف الواحد متجاورة في _authors ومرتبة داخله حسب العنوان، لذلك لا توجد فهارس للمؤلفين)
+    _filtered = {}
+    # عدد الكتب من كل نوع (Book أو EBook)
+    _type_counts = Counter()
+    # فهرس البحث النصي في العناوين وأسماء المؤلفين
+    _search_index = CatalogSearchIndex()
+    # هل توجد لقطات تشارك قائمة الكتب أو الفروع الحالية (النسخ عند الحذف فقط)
+    _shared = False
+    # قفل لحماية القائمة والفهارس عند التعديل من عدة خيوط
+    _lock = threading.Lock()
+
+    # إنشاء مكتبة مستقلة لها كتبها وفروعها وفهارسها الخاصة
+    def __init__(self):
+        self._books = []
+        self._branches = []
+        self._books_by_isbn = {}
+        self._books_by_author = {}
+        self._books_by_category = {}
+        self._titles = SortedKeys()
+        self._authors = SortedKeys()
+        self._filtered = {}
+        self._type_counts = Counter()
+        self._search_index = CatalogSearchIndex()
+        self._shared = False
+        self._lock = threading.Lock()
+    
+    # إضافة كتاب إلى مكتبة المكتبة مع تحديث الفهارس
+    # إذا كان في المكتبة كتاب آخر بنفس رقم ISBN يتم استبداله في كل الفهارس
+    @scopedmethod
+    def add_book(self, book):
+        with self._lock:
+            if self._add(book):
+                self._titles.add((book.title, book.isbn))
+                self._authors.add((book.author, book.title, book.isbn))
+                for name, key in self._filtered_keys(book):
+                    self._filtered_index(name).add(key)
+    
+    # إضافة مجموعة من الكتب دفعة واحدة (قفل واحد للدفعة كلها)
+    # يتم دمج مفاتيح الدفعة في الفهارس المرتبة مرة واحدة بدلًا من إضافتها كتابًا كتابًا
+    @scopedmethod
+    def add_books(self, books):
+        with self._lock:
+            # عند تكرار رقم ISBN داخل الدفعة يتم الاحتفاظ بآخر كتاب
+            added = [book for book in {book.isbn: book for book in books}.values() if self._add(book)]
+            self._add_sorted(added)
+    
+    # مفاتيح الكتاب في الفهارس المرتبة المصفاة
+    @staticmethod
+    def _filtered_keys(book):
+        title_key = (book.title, book.isbn)
+        author_key = (book.author, book.title, book.isbn)
+        kind = type(book).__name__
+        return ((("title", "kind", kind), title_key), (("title", "category", book.category), title_key),
+                (("author", "kind", kind), author_key), (("author", "category", book.category), author_key))
+
+    # إضافة مفاتيح دفعة من الكتب إلى الفهارس المرتبة، مرة واحدة لكل فهرس (يجب استدعاؤها والقفل محجوز)
+    @scopedmethod
+    def _add_sorted(self, books):
+        self._titles.update((book.title, book.isbn) for book in books)
+        self._authors.update((book.author, book.title, book.isbn) for book in books)
+        groups = {}
+        for book in books:
+            for name, key in self._filtered_keys(book):
+                groups.setdefault(name, []).append(key)
+        for name, keys in groups.items():
+            self._filtered_index(name).update(keys)
+
+    # الفهرس المصفى name، مع إنشائه إذا لم يكن موجودًا (يجب استدعاؤها والقفل محجوز)
+    @scopedmethod
+    def _filtered_index(self, name):
+        index = self._filtered.get(name)
+        if index is None:
+            index = self._filtered[name] = SortedKeys()
+        return index
+    
+    # تحديث القائمة وفهارس التجزئة وفهرس البحث (يجب استدعاؤها والقفل محجوز)
+    # الفهارس المرتبة يتم تحديثها من add_book و add_books (انظر _add_sorted)
+    # ترجع False إذا كان الكتاب نفسه موجودًا بالفعل في المكتبة
+    @scopedmethod
+    def _add(self, book):
+        old = self._books_by_isbn.get(book.isbn)
+        if old is book:
+            return False
+        if old is not None:
+            self._remove(old)
+        self._books.append(book)
+        self._books_by_isbn[book.isbn] = book
+        self._books_by_author.setdefault(book.author, []).append(book)
+        self._books_by_category.setdefault(book.category, []).append(book)
+        self._type_counts[type(book).__name__] += 1
+        self._search_index.add(book)
+        return True
+    
+    # حذف كتاب من المكتبة وإزالته من الفهارس
+    @scopedmethod
+    def remove_book(self, book):
+        with self._lock:
+            if self._books_by_isbn.get(book.isbn) is not book:
+                return False
+            self._remove(book)
+            return True
+    
+    # حذف كتاب من القائمة وكل الفهارس (يجب استدعاؤها والقفل محجوز)
+    # إذا كانت هناك لقطات تشارك القائمة يتم نسخها أولًا حتى لا تتغير اللقطات
+    @scopedmethod
+    def _remove(self, book):
+        if self._shared:
+            self._books = list(self._books)
+            self._branches = list(self._branches)
+            self._shared = False
+        self._books.remove(book)
+        del self._books_by_isbn[book.isbn]
+        self._remove_from_index(self._books_by_author, book.author, book)
+        self._remove_from_index(self._books_by_category, book.category, book)
+        self._titles.remove((book.title, book.isbn))
+        self._authors.remove((book.author, book.title, book.isbn))
+        for name, key in self._filtered_keys(book):
+            index = self._filtered[name]
+            index.remove(key)
+            if not index:
+                del self._filtered[name]
+        self._type_counts[type(book).__name__] -= 1
+        self._search_index.remove(book)
+    
+    @staticmethod
+    def _remove_from_index(index, key, book):
+        books = index[key]
+        books.remove(book)
+        if not books:
+            del index[key]
+        
+    # استرجاع قائمة الكتب من المكتبة
+    @scopedmethod
+    def get_books(self):
+        return self._books
+    
+    # الحصول على لقطة ثابتة من الكتب والفروع بتكلفة O(1) بدون نسخ القوائم
+    # يمكن للتقارير الطويلة قراءتها بدون أقفال بينما تستمر الإضافة إلى المكتبة
+    @scopedmethod
+    def snapshot(self):
+        with self._lock:
+            self._shared = True
+            return CatalogSnapshot(CatalogView(self._books, len(self._books)),
+                                   CatalogView(self._branches, len(self._branches)))
+    
+    # البحث عن كتاب برقم ISBN
+    @scopedmethod
+    def find_by_isbn(self, isbn):
+        return self._books_by_isbn.get(isbn)
+    
+    # البحث عن كتب مؤلف معين
+    @scopedmethod
+    def find_by_author(self, author):
+        return list(self._books_by_author.get(author, ()))
+    
+    # البحث عن الكتب في فئة معينة
+    @scopedmethod
+    def find_by_category(self, category):
+        return list(self._books_by_category.get(category, ()))
+    
+    # البحث عن الكتب التي يبدأ عنوانها ببادئة معينة (مرتبة حسب العنوان)
+    @scopedmethod
+    def find_by_title_prefix(self, prefix):
+        books = []
+        for title, isbn in self._titles.irange((prefix,)):
+            if not title.startswith(prefix):
+                break
+            books.append(self._books_by_isbn[isbn])
+        return books
+    
+    # عدد الكتب المطابقة للتصفية: عند استخدام تصفية واحدة (أو بدون تصفية) يتم إرجاع عدد محفوظ
+    # مسبقًا، وعند الجمع بين أكثر من تصفية يتم العد من أصغر فهرس مطابق
+    @scopedmethod
+    def count(self, kind=None, category=None, author=None):
+        kind = kind.__name__ if isinstance(kind, type) else kind
+        filters = [value for value in (kind, category, author) if value is not None]
+        if not filters:
+            return len(self._books)
+        if len(filters) == 1:
+            if kind is not None:
+                return self._type_counts[kind]
+            index = self._books_by_category if category is not None else self._books_by_author
+            return len(index.get(filters[0], ()))
+        candidates = min((self._books_by_category.get(category, ()) if category is not None else self._books,
+                          self._books_by_author.get(author, ()) if author is not None else self._books), key=len)
+        return sum(1 for book in candidates if _matches(book, kind, category, author))
+    
+    # المرور على الكتب مرتبة حسب العنوان أو المؤلف باستخدام الفهارس المرتبة (بدون إعادة الترتيب)
+    # after هو مفتاح آخر كتاب في الصفحة السابقة (انظر sort_key) ويتم البدء بعده مباشرة
+    # عند تحديد المؤلف يتم البدء من أول كتاب له في _authors (أو بعد المؤشر) والتوقف بعد آخر كتاب له،
+    # وعند التصفية حسب النوع أو الفئة يتم المرور على أصغر فهرس مصفى مطابق فقط
+    # (والتصفيات الأخرى يتم التحقق منها لكل كتاب)
+    # يمكن استخدامه أثناء الإضافة والحذف من خيوط أخرى: لا يتكرر كتاب ولا يتم تخطي كتاب موجود
+    @scopedmethod
+    def iter_books(self, kind=None, category=None, author=None, order_by="title", after=None):
+        kind = kind.__name__ if isinstance(kind, type) else kind
+        if order_by not in ("title", "author"):
+            raise ValueError(f"Unsupported sort order: {order_by}")
+        start = tuple(after) if after is not None else None
+        if author is not None:
+            if start is not None and order_by == "title":
+                start = (author,) + start
+            if start is None or start < (author,):
+                keys = self._authors.irange((author,))
+            else:
+                keys = self._authors.irange(start, inclusive=False)
+        else:
+            names = [(order_by, name, value) for name, value in (("kind", kind), ("category", category))
+                     if value is not None]
+            if names:
+                index = min((self._filtered.get(name) for name in names),
+                            key=lambda index: 0 if index is None else len(index))
+                if index is None:
+                    return
+            else:
+                index = self._titles if order_by == "title" else self._authors
+            keys = index.irange(start, inclusive=False)
+        for key in keys:
+            if author is not None and key[0] != author:
+                break
+            book = self._books_by_isbn.get(key[-1])
+            if book is not None and _matches(book, kind, category, author):
+                yield book
+    
+    # مفتاح الترتيب الخاص بالكتاب (يستخدم كمؤشر cursor للصفحة التالية)
+    @staticmethod
+    def sort_key(book, order_by="title"):
+        if order_by == "title":
+            return (book.title, book.isbn)
+        return (book.author, book.title, book.isbn)
+    
+    # البحث النصي في العناوين وأسماء المؤلفين مرتبًا حسب BM25 (انظر CatalogSearchIndex)
+    @scopedmethod
+    def search(self, query, limit=10, prefix=False, fuzzy=False):
+        return self._search_index.search(query, limit, prefix, fuzzy)
+    
+    # إضافة فرع جديد للمكتبة
+    @scopedmethod
+    def add_branch(self, branch):
+        with self._lock:
+            self._branches.append(branch)
+        
+    # استرجاع قائمة الفروع في المكتبة
+    @scopedmethod
+    def get_branches(self):
+        return self._branches
+    
+    # حفظ الكتب والفروع في ملف لقطة ثنائي (انظر LibrarySnapshot)
+    # الوحدة snapshot تعتمد على الفروع التي تعتمد على هذه الوحدة، لذلك يتم استيرادها داخل الدوال
+    @scopedmethod
+    def save_snapshot(self, path):
+        from .snapshot import LibrarySnapshot
+        LibrarySnapshot.write(path, self._books, self._branches)
+
+    # تحميل جميع الكتب والفروع من ملف لقطة إلى المكتبة (مع بناء كل الفهارس)
+    # كتب اللقطة تحل محل الكتب الموجودة التي لها نفس رقم ISBN، كما في add_books
+    @scopedmethod
+    def load_snapshot(self, path):
+        from .snapshot import LibrarySnapshot
+        with LibrarySnapshot(path) as snapshot:
+            self.add_books(snapshot.books())
+            for branch in snapshot.branches():
+                self.add_branch(branch)
+
+    # فتح ملف لقطة بدون تحميل كتبه، للوصول إلى بعض الكتب فقط (مثال: open_snapshot(path).find_by_isbn(isbn))
+    @staticmethod
+    def open_snapshot(path):
+        from .snapshot import LibrarySnapshot
+        return LibrarySnapshot(path)
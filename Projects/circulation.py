@@ -0,0 +1,398 @@
+# الفروع والعملاء والإعارات والغرامات
+# استيراد Counter لتخزين عدد النسخ من كل كتاب
+from collections import Counter
+from itertools import repeat
+import heapq
+# استيراد threading لحماية العمليات المتزامنة على الفروع والعملاء
+import threading
+import time
+
+from .catalog import Library
+from .events import BookBorrowed, BookReturned, CopyAdded, CopyRemoved, FinePaid
+from .instrumentation import metrics
+from .items import Book
+
+# فئة Branch تمثل فرعًا من فروع المكتبة
+class Branch:
+    # مخزن لحفظ مخزون الفروع (اختياري، مثال: Branch.store = SQLiteCirculationStore("library.db"))
+    store = None
+    # فهرس توفر الكتب في الفروع (اختياري، مثال: Branch.availability_index = AvailabilityIndex())
+    availability_index = None
+    # سجل الأحداث (اختياري، مثال: Branch.event_log = EventLog("events"))
+    event_log = None
+
+    def __init__(self, name, location, coordinates=None):
+        self.name = name  # اسم الفرع
+        self.location = location  # مكان الفرع
+        self.coordinates = coordinates  # إحداثيات الفرع (x, y) لإيجاد أقرب فرع
+        self.books = Counter()  # عدد النسخ المتاحة من كل كتاب في الفرع (حسب ISBN)
+        self._titles = {}  # الكتاب المقابل لكل رقم ISBN
+        # قفل خاص بالفرع، فعمليات الاستعارة في فروع مختلفة لا تنتظر بعضها
+        self._lock = threading.Lock()
+    
+    # إضافة نسخة من كتاب إلى الفرع
+    def add_book(self, book):
+        with self._lock:
+            self._titles[book.isbn] = book
+            self.books[book.isbn] += 1
+        if self.store is not None:
+            self.store.record_inventory(self.name, book.isbn, 1)
+        if self.availability_index is not None:
+            self.availability_index.update(self, book.isbn, 1)
+        if self.event_log is not None:
+            self.event_log.append(CopyAdded(self.name, book.isbn, time.time()))
+    
+    # إخراج نسخة من الكتاب من الفرع إذا كانت متاحة
+    # (التحقق والإخراج يتمان تحت نفس القفل فلا تُعار النسخة مرتين)
+    def remove_book(self, book):
+        with self._lock:
+            if self.books[book.isbn] <= 0:
+                return False
+            self.books[book.isbn] -= 1
+            if not self.books[book.isbn]:
+                del self.books[book.isbn]
+        if self.store is not None:
+            self.store.record_inventory(self.name, book.isbn, -1)
+        if self.availability_index is not None:
+            self.availability_index.update(self, book.isbn, -1)
+        if self.event_log is not None:
+            self.event_log.append(CopyRemoved(self.name, book.isbn, time.time()))
+        return True
+    
+    # تعيين عدد النسخ من كتاب مباشرة بدون تسجيل التغيير في المخزن أو فهرس التوفر أو سجل الأحداث
+    # (تستخدم عند استعادة حالة محفوظة بالفعل، من المخزن أو من لقطة)
+    def restore(self, book, copies):
+        with self._lock:
+            self._titles[book.isbn] = book
+            self.books[book.isbn] = copies
+    
+    # استعادة مخزون الفرع من المخزن (الكتب يتم البحث عنها في المكتبة حسب ISBN)
+    def load(self, store, library=Library):
+        for isbn, copies in store.load_inventory(self.name).items():
+            book = library.find_by_isbn(isbn)
+            if book is not None:
+                self.restore(book, copies)
+    
+    # التحقق من توفر نسخة من الكتاب في الفرع
+    def is_available(self, book):
+        return self.books[book.isbn] > 0
+    
+    # عدد النسخ المتاحة من الكتاب في الفرع
+    def copies(self, book):
+        return self.books[book.isbn]
+    
+    # الحصول على قائمة الكتب المتاحة في الفرع (نسخة لكل عنصر)
+    def get_books(self):
+        with self._lock:
+            return [self._titles[isbn] for isbn in self.books.elements()]
+    
+    # تمثيل النص للفرع
+    def __str__(self):
+        return f"Branch: {self.name} - {self.location}"
+    
+    # تمثيل الفرع بطريقة أكثر تفصيلًا
+    def __repr__(self):
+        return f"Branch('{self.name}', '{self.location}')"
+
+# فئة Person تمثل شخصًا (يمكن أن يكون عميلًا في المكتبة)
+class Person:
+    def __init__(self, name, age):
+        self.name = name  # اسم الشخص
+        self.age = age  # عمر الشخص
+
+    # تمثيل النص للشخص
+    def __str__(self):
+        return f"{self.name}, {self.age} years old"
+
+# فئة Customer تمثل العميل الذي يمكنه استعارة الكتب
+# وتورث من فئة Person
+class Customer(Person):
+    # متتبع الإعارات وتواريخ استحقاقها (اختياري، مثال: Customer.loan_tracker = LoanTracker())
+    loan_tracker = None
+    # مخزن لحفظ الإعارات والمدفوعات (اختياري، مثال: Customer.store = SQLiteCirculationStore("library.db"))
+    store = None
+    # محرك التوصيات الذي يتعلم من التقييمات والإعارات (اختياري، مثال: Customer.recommender = Recommender())
+    recommender = None
+    # سجل الأحداث (اختياري، مثال: Customer.event_log = EventLog("events"))
+    event_log = None
+
+    def __init__(self, name, age, customer_id):
+        super().__init__(name, age)  # استدعاء مُنشئ فئة Person
+        self.customer_id = customer_id  # تخزين معرف العميل
+        self.borrowed_books = Counter()  # عدد النسخ المستعارة من كل كتاب (حسب ISBN)
+        self.payment_history = []  # سجل المدفوعات (مثل الغرامات)
+        self._lock = threading.Lock()  # قفل لحماية قائمة الكتب المستعارة
+
+    # التحقق من أن العميل استعار نسخة من الكتاب
+    def has_borrowed(self, book):
+        return self.borrowed_books[book.isbn] > 0
+
+    # استعارة كتاب من فرع معين (يتم إخراج نسخة من الفرع إذا كانت متاحة)
+    @metrics.instrument("borrow_book")
+    def borrow_book(self, book, branch):
+        if isinstance(book, Book):
+            if not branch.remove_book(book):
+                print(f"{book.title} is not available at {branch.name} branch")
+                return False
+            with self._lock:
+                self.borrowed_books[book.isbn] += 1
+            if self.loan_tracker is not None:
+                self.loan_tracker.record_borrow(self, book, branch)
+            if self.store is not None:
+                self.store.record_loan(self.customer_id, book.isbn, 1)
+            if self.recommender is not None:
+                self.recommender.record_borrow(self.customer_id, book.isbn)
+            if self.event_log is not None:
+                self.event_log.append(BookBorrowed(self.customer_id, book.isbn, branch.name, time.time()))
+            print(f"{self.name} borrowed {book.title} from {branch.name} branch")
+            return True
+        return False
+    
+    # إعادة كتاب إلى فرع المكتبة
+    @metrics.instrument("return_book")
+    def return_book(self, book, branch):
+        with self._lock:
+            if not self.has_borrowed(book):
+                return False
+            self.borrowed_books[book.isbn] -= 1
+            if not self.borrowed_books[book.isbn]:
+                del self.borrowed_books[book.isbn]
+        branch.add_book(book)  # إعادة النسخة إلى الفرع
+        if self.loan_tracker is not None:
+            self.loan_tracker.record_return(self, book)
+        if self.store is not None:
+            self.store.record_loan(self.customer_id, book.isbn, -1)
+        if self.event_log is not None:
+            self.event_log.append(BookReturned(self.customer_id, book.isbn, branch.name, time.time()))
+        print(f"{self.name} returned {book.title} to {branch.name} branch")
+        return True
+    
+    # تقييم الكتاب
+    def rate_book(self, book, rating):
+        if self.has_borrowed(book):
+            if self.recommender is not None:
+                self.recommender.record_rating(self.customer_id, book.isbn, rating)
+            print(f"{self.name} rated the book '{book.title}' with {rating} stars")
+    
+    # دفع غرامة
+    @metrics.instrument("pay_fine")
+    def pay_fine(self, amount):
+        self.payment_history.append(amount)
+        if self.store is not None:
+            self.store.record_payment(self.customer_id, amount)
+        if self.event_log is not None:
+            self.event_log.append(FinePaid(self.customer_id, amount, time.time()))
+        print(f"{self.name} paid a fine of {amount} USD")
+    
+    # استعادة الكتب المستعارة وسجل المدفوعات من المخزن
+    def load(self, store):
+        with self._lock:
+            self.borrowed_books = store.load_loans(self.customer_id)
+            self.payment_history = store.load_payments(self.customer_id)
+    
+    # تمثيل النص للعميل
+    def __str__(self):
+        return f"{super().__str__()} (Customer ID: {self.customer_id})"
+    
+    # تمثيل العميل بطريقة أكثر تفصيلًا
+    def __repr__(self):
+        return f"Customer('{self.name}', {self.age}, '{self.customer_id}')"
+
+# فئة BillingSystem تمثل نظام الفواتير الذي يقوم بتوليد الفواتير للعملاء
+class BillingSystem:
+    # الغرامة اليومية الافتراضية لكل كتاب، ويمكن تخصيصها لكل فئة
+    default_daily_rate = 1
+    daily_rates = {}
+    # الحد الأقصى لغرامة الفاتورة الواحدة (None يعني بدون حد)
+    max_fine = None
+    # الحد الأقصى لغرامات كتب كل فئة في الفاتورة الواحدة (وفي الإعارة الواحدة في LoanTracker)
+    # ويتم تطبيقه قبل الحد العام max_fine، والفئات غير الموجودة هنا بدون حد خاص
+    max_fines = {}
+
+    # الغرامة اليومية لكتاب حسب فئته
+    @classmethod
+    def daily_rate(cls, category=None):
+        return cls.daily_rates.get(category, cls.default_daily_rate)
+
+    # تطبيق الحد الأقصى على الغرامة
+    @classmethod
+    def _cap(cls, amount):
+        if cls.max_fine is not None and amount > cls.max_fine:
+            return cls.max_fine
+        return amount
+
+    # تطبيق الحد الأقصى الخاص بالفئة على غرامات كتب هذه الفئة
+    @classmethod
+    def _cap_category(cls, amount, category):
+        limit = cls.max_fines.get(category)
+        if limit is not None and amount > limit:
+            return limit
+        return amount
+
+    @classmethod
+    @metrics.instrument("generate_invoice")
+    def generate_invoice(cls, customer, books_borrowed, overdue_days=0):
+        total_amount = 0
+        # حساب الغرامات بناءً على الأيام المتأخرة، مع حد كل فئة ثم الحد العام
+        if overdue_days > 0:
+            rates = Counter()
+            for book in books_borrowed:
+                category = getattr(book, "category", None)
+                rates[category] += cls.daily_rate(category)
+            total_amount = cls._cap(sum(cls._cap_category(rate * overdue_days, category)
+                                        for category, rate in rates.items()))
+        print(f"Invoice for {customer.name}: Total Fine = {total_amount} USD")
+        return total_amount
+
+    # توليد فواتير لعدد كبير من العملاء دفعة واحدة بدون طباعة
+    # كل صف يحتوي على معرف العميل وعدد الكتب المستعارة وعدد الأيام المتأخرة
+    # (واختياريًا فئة الكتب)، ويتم جمع الصفوف الخاصة بنفس العميل
+    # الفئات التي لها حد خاص تجمع منفصلة لكل عميل حتى يطبق حدها قبل الجمع
+    @classmethod
+    def generate_invoices(cls, customer_ids, loan_counts, overdue_days, categories=None):
+        if categories is None:
+            categories = repeat(None)
+        totals = {}
+        capped = {}
+        for customer_id, loans, days, category in zip(customer_ids, loan_counts, overdue_days, categories):
+            if days <= 0:
+                totals.setdefault(customer_id, 0)
+            elif category in cls.max_fines:
+                key = (customer_id, category)
+                capped[key] = capped.get(key, 0) + loans * days * cls.daily_rate(category)
+                totals.setdefault(customer_id, 0)
+            else:
+                totals[customer_id] = totals.get(customer_id, 0) + loans * days * cls.daily_rate(category)
+        for (customer_id, category), amount in capped.items():
+            totals[customer_id] += cls._cap_category(amount, category)
+        return {customer_id: cls._cap(amount) for customer_id, amount in totals.items()}
+
+# فئة Loan تمثل إعارة نسخة واحدة من كتاب
+class Loan:
+    __slots__ = ("customer", "book", "branch", "borrowed_at", "due_at", "returned_at", "accrued_until", "fine")
+
+    def __init__(self, customer, book, branch, borrowed_at, due_at):
+        self.customer = customer
+        self.book = book
+        self.branch = branch
+        self.borrowed_at = borrowed_at
+        self.due_at = due_at
+        self.returned_at = None
+        self.accrued_until = due_at  # الوقت الذي تم حساب الغرامة حتى لحظته
+        self.fine = 0  # الغرامة المتراكمة على هذه الإعارة
+
+    def __repr__(self):
+        return f"Loan('{self.customer.customer_id}', '{self.book.isbn}', due_at={self.due_at})"
+
+# فئة LoanTracker تسجل وقت الاستعارة وتاريخ الاستحقاق لكل نسخة مستعارة
+# الإعارات محفوظة في كومة (heap) مرتبة حسب تاريخ الاستحقاق، لذلك إيجاد الإعارات المتأخرة
+# يمر فقط على الإعارات المتأخرة (k) بتكلفة O(k log k) بدلًا من المرور على كل العملاء
+# الإعارات المعادة لا تحذف من الكومة مباشرة بل عند وصولها إلى قمتها
+class LoanTracker:
+    DAY = 86400  # عدد الثواني في اليوم
+
+    def __init__(self, loan_days=14):
+        self.loan_days = loan_days
+        self._heap = []  # (تاريخ الاستحقاق، رقم تسلسلي، الإعارة)
+        self._open = {}  # (معرف العميل، ISBN) -> الإعارات المفتوحة بترتيب الاستعارة
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    # تسجيل استعارة نسخة
+    def record_borrow(self, customer, book, branch, now=None, loan_days=None):
+        now = time.time() if now is None else now
+        due_at = now + (self.loan_days if loan_days is None else loan_days) * self.DAY
+        loan = Loan(customer, book, branch, now, due_at)
+        with self._lock:
+            self._sequence += 1
+            heapq.heappush(self._heap, (due_at, self._sequence, loan))
+            self._open.setdefault((customer.customer_id, book.isbn), []).append(loan)
+        return loan
+
+    # تسجيل إعادة نسخة (أقدم إعارة مفتوحة للعميل من هذا الكتاب) مع حساب غرامتها النهائية
+    def record_return(self, customer, book, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            loans = self._open.get((customer.customer_id, book.isbn))
+            if not loans:
+                return None
+            loan = loans.pop(0)
+            if not loans:
+                del self._open[(customer.customer_id, book.isbn)]
+            self._accrue(loan, now)
+            loan.returned_at = now
+            while self._heap and self._heap[0][2].returned_at is not None:
+                heapq.heappop(self._heap)
+        return loan
+
+    # الإعارات المفتوحة التي تجاوزت تاريخ استحقاقها في الوقت as_of
+    # يتم المرور على الكومة كشجرة: إذا لم تكن العقدة متأخرة فلن يكون أي من أبنائها متأخرًا
+    def overdue(self, as_of=None):
+        as_of = time.time() if as_of is None else as_of
+        with self._lock:
+            loans = []
+            frontier = [(self._heap[0][0], 0)] if self._heap else []
+            while frontier:
+                due_at, index = heapq.heappop(frontier)
+                if due_at > as_of:
+                    break
+                loan = self._heap[index][2]
+                if loan.returned_at is None:
+                    loans.append(loan)
+                for child in (2 * index + 1, 2 * index + 2):
+                    if child < len(self._heap):
+                        heapq.heappush(frontier, (self._heap[child][0], child))
+            return loans
+
+    # إضافة غرامة الأيام الكاملة التي مرت منذ آخر حساب (بدون تجاوز الحد الخاص بفئة الكتاب)
+    def _accrue(self, loan, as_of):
+        days = int((as_of - loan.accrued_until) // self.DAY)
+        if days <= 0:
+            return 0
+        category = loan.book.category
+        amount = BillingSystem._cap_category(loan.fine + days * BillingSystem.daily_rate(category), category) - loan.fine
+        loan.fine += amount
+        loan.accrued_until += days * self.DAY
+        return amount
+
+    # حساب الغرامات الجديدة للإعارات المتأخرة فقط، وإرجاعها مجمعة لكل عميل
+    def accrue_fines(self, as_of=None):
+        as_of = time.time() if as_of is None else as_of
+        fines = {}
+        for loan in self.overdue(as_of):
+            with self._lock:
+                amount = self._accrue(loan, as_of)
+            if amount:
+                customer_id = loan.customer.customer_id
+                fines[customer_id] = fines.get(customer_id, 0) + amount
+        return fines
+
+# فئة AsyncCirculationDesk تمثل واجهة غير متزامنة (asyncio) لعمليات الاستعارة والإعادة
+# ودفع الغرامات والإشعارات، بحيث تخدم حلقة أحداث واحدة آلاف الجلسات في نفس الوقت
+# خدمة الدفع وخدمة البريد يجب أن توفرا دوال async (مثل AsyncPaymentService
+# و AsyncEmailService في SOLID.py) وهي المسؤولة عن تحديد عدد الطلبات المتزامنة
+class AsyncCirculationDesk:
+    def __init__(self, payment_service, email_service=None):
+        self.payment_service = payment_service
+        self.email_service = email_service
+
+    # دوال العميل قد تكتب في المخزن أو سجل الأحداث (Customer.store و Customer.event_log)
+    # لذلك يتم تنفيذها في خيط منفصل حتى لا توقف حلقة الأحداث
+    async def borrow_book(self, customer, book, branch):
+        import asyncio
+        return await asyncio.to_thread(customer.borrow_book, book, branch)
+
+    async def return_book(self, customer, book, branch):
+        import asyncio
+        return await asyncio.to_thread(customer.return_book, book, branch)
+
+    # دفع الغرامة عبر خدمة الدفع ثم تسجيلها في سجل العميل
+    async def pay_fine(self, customer, amount):
+        import asyncio
+        await self.payment_service.process_payment(amount)
+        await asyncio.to_thread(customer.pay_fine, amount)
+
+    # إرسال إشعار للعميل عبر خدمة البريد
+    async def notify(self, email, subject, body):
+        if self.email_service is not None:
+            await self.email_service.send_email(email, subject, body)
@@ -0,0 +1,148 @@
+# أحداث المكتبة وسجلها الدائم (EventLog) والعروض التي تبنى منها
+from collections import Counter, namedtuple
+import os
+import threading
+
+# أنواع الأحداث التي تغير حالة المكتبة
+# CopyAdded و CopyRemoved تمثل حركة النسخ في الفروع (ومنها الاستعارة والإعادة)
+# و BookBorrowed و BookReturned و FinePaid تمثل عمليات العملاء
+BookBorrowed = namedtuple("BookBorrowed", ["customer_id", "isbn", "branch", "timestamp"])
+
+BookReturned = namedtuple("BookReturned", ["customer_id", "isbn", "branch", "timestamp"])
+
+FinePaid = namedtuple("FinePaid", ["customer_id", "amount", "timestamp"])
+
+CopyAdded = namedtuple("CopyAdded", ["branch", "isbn", "timestamp"])
+
+CopyRemoved = namedtuple("CopyRemoved", ["branch", "isbn", "timestamp"])
+
+EVENT_TYPES = {event.__name__: event for event in (BookBorrowed, BookReturned, FinePaid, CopyAdded, CopyRemoved)}
+
+# فئة EventLog تمثل سجل أحداث يضاف إليه فقط، محفوظ في ملفات (segments) داخل مجلد
+# كل حدث سطر JSON يتم كتابته للنظام (flush) فور إضافته، وعند تجاوز الملف الحالي segment_size بايت
+# يتم البدء في ملف جديد
+# العروض المشتركة (subscribers) يتم تحديثها مع كل حدث، وبعد توقف البرنامج يمكن
+# إعادة بناء حالتها بقراءة السجل من البداية باستخدام replay
+# إذا توقف البرنامج أثناء كتابة حدث يبقى في آخر الملف سطر غير مكتمل: القراءة تتجاهله،
+# وفتح السجل مرة أخرى يحذفه قبل إضافة أحداث جديدة
+class EventLog:
+    def __init__(self, directory, segment_size=64 * 1024 * 1024):
+        self.directory = directory
+        self.segment_size = segment_size
+        self._subscribers = []
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        segments = self.segments()
+        self._segment = int(os.path.basename(segments[-1])[8:-4]) if segments else 1
+        if segments:
+            self._truncate_torn_tail(segments[-1])
+        self._file = open(self._path(self._segment), "ab")
+
+    # حذف السطر غير المكتمل (بدون \n) من آخر الملف إن وجد
+    @staticmethod
+    def _truncate_torn_tail(path, block_size=4096):
+        with open(path, "rb+") as file:
+            end = position = file.seek(0, os.SEEK_END)
+            while position > 0:
+                start = max(position - block_size, 0)
+                file.seek(start)
+                newline = file.read(position - start).rfind(b"\n")
+                if newline >= 0:
+                    if start + newline + 1 < end:
+                        file.truncate(start + newline + 1)
+                    return
+                position = start
+            file.truncate(0)
+
+    def _path(self, number):
+        return os.path.join(self.directory, f"segment-{number:06d}.log")
+
+    # ملفات السجل بالترتيب
+    def segments(self):
+        names = sorted(name for name in os.listdir(self.directory)
+                       if name.startswith("segment-") and name.endswith(".log"))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def subscribe(self, view):
+        self._subscribers.append(view)
+
+    def append(self, event):
+        import json
+        line = (json.dumps([type(event).__name__, *event], ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file.tell() + len(line) > self.segment_size and self._file.tell():
+                self._file.close()
+                self._segment += 1
+                self._file = open(self._path(self._segment), "ab")
+            self._file.write(line)
+            self._file.flush()
+            for view in self._subscribers:
+                view.apply(event)
+
+    # قراءة كل الأحداث المحفوظة بالترتيب
+    def events(self):
+        import json
+        self.flush()
+        for path in self.segments():
+            with open(path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # حدث لم تكتمل كتابته
+                    name, *fields = json.loads(line)
+                    yield EVENT_TYPES[name](*fields)
+
+    # إعادة بناء العروض بقراءة كل الأحداث المحفوظة (بعد إعادة تشغيل البرنامج مثلًا)
+    def replay(self, *views):
+        count = 0
+        for event in self.events():
+            for view in views:
+                view.apply(event)
+            count += 1
+        return count
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+# العرض الأساسي: يستقبل كل حدث ويوجهه إلى دالة on_<اسم الحدث> إذا وجدت
+class MaterializedView:
+    def apply(self, event):
+        handler = getattr(self, f"on_{type(event).__name__}", None)
+        if handler is not None:
+            handler(event)
+
+# عدد الإعارات المفتوحة في كل فرع
+class LoansPerBranch(MaterializedView):
+    def __init__(self):
+        self.loans = Counter()
+
+    def on_BookBorrowed(self, event):
+        self.loans[event.branch] += 1
+
+    def on_BookReturned(self, event):
+        self.loans[event.branch] -= 1
+
+# مجموع الغرامات المدفوعة في كل يوم (بتوقيت UTC)
+class FinesPerDay(MaterializedView):
+    def __init__(self):
+        self.fines = Counter()
+
+    def on_FinePaid(self, event):
+        from datetime import datetime, timezone
+        day = datetime.fromtimestamp(event.timestamp, timezone.utc).date().isoformat()
+        self.fines[day] += event.amount
+
+# أكثر الكتب استعارة
+class TopTitles(MaterializedView):
+    def __init__(self):
+        self.borrows = Counter()
+
+    def on_BookBorrowed(self, event):
+        self.borrows[event.isbn] += 1
+
+    def top(self, n=10):
+        return self.borrows.most_common(n)
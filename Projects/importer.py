@@ -0,0 +1,61 @@
+# استيراد الكتب من ملفات CSV و JSON Lines
+from itertools import islice
+import os
+
+from .catalog import Library
+from .items import Book, EBook, _parse_number
+from .reports import _bounded_map
+
+# تحويل مجموعة من أسطر ملف CSV أو JSON Lines إلى صفوف (العنوان، المؤلف، ISBN، الفئة، حجم الملف)
+# دالة على مستوى الوحدة لكي تعمل داخل عمليات منفصلة
+def _parse_catalog_lines(fmt, header, lines):
+    import csv
+    import json
+    if fmt == "csv":
+        records = (dict(zip(header, row)) for row in csv.reader(lines))
+    else:
+        records = (json.loads(line) for line in lines if line.strip())
+    rows = []
+    for record in records:
+        file_size = record.get("file_size")
+        if file_size in ("", None):
+            file_size = None
+        elif isinstance(file_size, str):
+            file_size = _parse_number(file_size)
+        rows.append((record["title"], record["author"], str(record["isbn"]), record["category"], file_size))
+    return rows
+
+# استيراد الكتب من ملف CSV (بسطر عناوين للأعمدة) أو JSON Lines إلى المكتبة
+# يتم قراءة الملف على دفعات وتحليل الدفعات في عمليات منفصلة (دفعتان لكل عملية على الأكثر في نفس الوقت)
+# ويتم تجاهل الكتب المكررة (حسب ISBN)، وكل دفعة تضاف بـ add_books فتدمج في الفهارس المرتبة مرة واحدة
+# الصفوف التي تحتوي على file_size تصبح EBook والباقي Book
+# progress (اختياري) دالة تستقبل عدد الصفوف المقروءة وعدد الكتب المضافة بعد كل دفعة
+# (حقول CSV التي تحتوي على سطر جديد داخلها غير مدعومة لأن الملف يقسم حسب الأسطر)
+def import_catalog(path, library=Library, fmt=None, chunk_size=10000, processes=None, progress=None):
+    import csv
+    from concurrent.futures import ProcessPoolExecutor
+    fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".json")) else "csv")
+    processes = processes or os.cpu_count()
+    rows_read = 0
+    added = 0
+    seen = set()
+    with open(path, newline="", encoding="utf-8") as file:
+        header = next(csv.reader([file.readline()])) if fmt == "csv" else None
+        chunks = ((fmt, header, lines) for lines in iter(lambda: list(islice(file, chunk_size)), []))
+        with ProcessPoolExecutor(processes) as executor:
+            for rows in _bounded_map(executor, _parse_catalog_lines, chunks, 2 * processes):
+                books = []
+                for title, author, isbn, category, file_size in rows:
+                    if isbn in seen or library.find_by_isbn(isbn) is not None:
+                        continue
+                    seen.add(isbn)
+                    if file_size is None:
+                        books.append(Book(title, author, isbn, category))
+                    else:
+                        books.append(EBook(title, author, isbn, category, file_size))
+                library.add_books(books)
+                rows_read += len(rows)
+                added += len(books)
+                if progress is not None:
+                    progress(rows_read, added)
+    return added
@@ -0,0 +1,143 @@
+# قياس عمليات المكتبة: عدد مرات الاستدعاء والزمن والذاكرة (Metrics) والكائن المشترك metrics
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+import sys
+import threading
+import time
+
+# فئة Metrics تسجل عدد مرات استدعاء كل عملية وزمنها (مدرج تكراري) وعدد الذاكرة المحجوزة
+# القياس معطل افتراضيًا، وفي هذه الحالة تكلفة الدالة المزخرفة هي فحص قيمة واحدة فقط
+class Metrics:
+    # الحدود العليا لفئات المدرج التكراري بالثواني (1 و 2.5 و 5 لكل قوة من 10)
+    buckets = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2.5, 5)) + (10.0, float("inf"))
+
+    def __init__(self):
+        self.enabled = False
+        self._operations = {}  # العملية -> [عدد الاستدعاءات، مجموع الزمن، عدد الكتل المحجوزة، عدد كل فئة]
+        self._lock = threading.Lock()
+        self._profiled = None  # اسم العملية التي يتم تحليلها باستخدام cProfile
+        self._profiler = None
+
+    # تسجيل قياس واحد لعملية
+    def record(self, name, seconds, allocations=0):
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = [0, 0.0, 0, [0] * len(self.buckets)]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += allocations
+            stats[3][bisect_left(self.buckets, seconds)] += 1
+
+    # تنفيذ دالة مع قياسها (وتحليلها بـ cProfile إذا كانت هي العملية المختارة)
+    def _call(self, name, function, args, kwargs):
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            if name == self._profiled:
+                return self._profiler.runcall(function, *args, **kwargs)
+            return function(*args, **kwargs)
+        finally:
+            self.record(name, time.perf_counter() - start, max(sys.getallocatedblocks() - blocks, 0))
+
+    # مزخرف لقياس عملية: @metrics.instrument("borrow_book")
+    def instrument(self, name):
+        def decorator(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                return self._call(name, function, args, kwargs)
+            return wrapper
+        return decorator
+
+    # قياس جزء من الكود: with metrics.measure("report"): ...
+    @contextmanager
+    def measure(self, name):
+        if not self.enabled:
+            yield
+            return
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, max(sys.getallocatedblocks() - blocks, 0))
+
+    # عدد مرات استدعاء العملية
+    def count(self, name):
+        return self._operations.get(name, [0])[0]
+
+    # تقدير النسبة المئوية للزمن (مثل 0.5 أو 0.99) من المدرج التكراري (الحد الأعلى للفئة)
+    def percentile(self, name, q):
+        stats = self._operations.get(name)
+        if stats is None:
+            return None
+        rank = q * stats[0]
+        seen = 0
+        for bound, count in zip(self.buckets, stats[3]):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    # تحليل كل استدعاءات عملية واحدة باستخدام cProfile
+    def start_profiling(self, name):
+        import cProfile
+        self._profiler = cProfile.Profile()
+        self._profiled = name
+
+    # إيقاف التحليل وحفظ النتائج بتنسيق pstats (يمكن عرضه بأدوات مثل snakeviz أو flameprof)
+    def stop_profiling(self, path):
+        self._profiled = None
+        self._profiler.dump_stats(path)
+        self._profiler = None
+
+    # النتائج بتنسيق Prometheus النصي (كل مجموعة مقاييس متصلة وقبلها سطر # TYPE الخاص بها)
+    def prometheus_text(self):
+        with self._lock:
+            operations = sorted((name, stats[0], stats[1], stats[2], list(stats[3]))
+                                for name, stats in self._operations.items())
+        lines = ["# TYPE library_operation_seconds histogram"]
+        for name, count, total, _, buckets in operations:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'library_operation_seconds_bucket{{operation="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'library_operation_seconds_sum{{operation="{name}"}} {total}')
+            lines.append(f'library_operation_seconds_count{{operation="{name}"}} {count}')
+        lines.append("# TYPE library_operation_allocated_blocks_total counter")
+        for name, _, _, allocations, _ in operations:
+            lines.append(f'library_operation_allocated_blocks_total{{operation="{name}"}} {allocations}')
+        return "\n".join(lines) + "\n"
+
+    # حفظ النتائج في ملف (مثلًا لـ node_exporter textfile collector)
+    def export_prometheus(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.prometheus_text())
+
+    # تشغيل خادم HTTP محلي يعرض النتائج على /metrics
+    def serve(self, port=9100, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+# كائن القياس المشترك لعمليات المكتبة (يتم تفعيله بـ metrics.enabled = True)
+metrics = Metrics()
@@ -0,0 +1,288 @@
+# عناصر المكتبة (الكتب والكتب الإلكترونية)، وتخزينها في أعمدة (BookTable)،
+# والذاكرة المؤقتة لتمثيلاتها النصية وتحويلها إلى حقول للتقارير
+# استيراد مكتبة ABC و abstractmethod لإنشاء فئات مجردة (Abstract Base Classes)
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import wraps
+import sys
+import threading
+import time
+
+# فئة RenderCache تحفظ النصوص الناتجة من get_details و __str__ و __repr__ للعناصر
+# يتم حذف أقدم العناصر استخدامًا (LRU) عند تجاوز عدد العناصر أو حجم الذاكرة المسموح،
+# وتنتهي صلاحية كل نص بعد ttl ثانية (None يعني بدون انتهاء)
+class RenderCache:
+    def __init__(self, max_entries=100000, ttl=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0  # الحجم التقريبي للنصوص المحفوظة بالبايت
+        self._entries = OrderedDict()  # (العنصر، نوع التمثيل) -> (النص، وقت انتهاء الصلاحية، الحجم)
+        self._kinds = {}  # العنصر -> أنواع التمثيل المحفوظة له
+        self._lock = threading.Lock()
+
+    # الحصول على التمثيل المحفوظ أو إنشاؤه باستخدام render وحفظه
+    def get_or_render(self, item, kind, render):
+        key = (item, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = render(item)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        size = sys.getsizeof(value)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (value, expires, size)
+            self._kinds.setdefault(item, set()).add(kind)
+            self.size += size
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     (self.max_bytes is not None and self.size > self.max_bytes)):
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= entry[2]
+        kinds = self._kinds[key[0]]
+        kinds.discard(key[1])
+        if not kinds:
+            del self._kinds[key[0]]
+
+    # حذف جميع التمثيلات المحفوظة لعنصر (يجب استدعاؤها عند تغيير بيانات العنصر)
+    def invalidate(self, item):
+        with self._lock:
+            for kind in list(self._kinds.get(item, ())):
+                self._discard((item, kind))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._kinds.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+# مزخرف (decorator) لدوال التمثيل النصي يستخدم Item.render_cache إذا تم تفعيله
+# وإذا لم يتم تفعيله يتم استدعاء الدالة مباشرة
+def cached_render(method):
+    @wraps(method)
+    def wrapper(self):
+        cache = Item.render_cache
+        if cache is None:
+            return method(self)
+        return cache.get_or_render(self, method.__qualname__, method)
+    return wrapper
+
+# تعريف فئة مجردة Item تمثل عنصر في المكتبة (مثل الكتاب)
+class Item(ABC):
+    # استخدام __slots__ بدلًا من __dict__ لتقليل استهلاك الذاكرة لكل عنصر
+    __slots__ = ("_title", "_author")
+    # ذاكرة مؤقتة اختيارية للتمثيلات النصية (مثال: Item.render_cache = RenderCache())
+    render_cache = None
+
+    def __init__(self, title, author):
+        # يتم تخزين العنوان واسم المؤلف كخصائص خاصة
+        self._title = title
+        self._author = author
+    
+    # تعريف الدالة المجردة للحصول على تفاصيل العنصر
+    @abstractmethod
+    def get_details(self):
+        pass
+    
+    # خاصية للحصول على العنوان
+    @property
+    def title(self):
+        return self._title
+    
+    # خاصية للحصول على اسم المؤلف
+    @property
+    def author(self):
+        return self._author
+
+# فئة Book تمثل الكتاب وتورث من فئة Item
+class Book(Item):
+    __slots__ = ("_isbn", "_category")
+
+    def __init__(self, title, author, isbn, category):
+        # استدعاء مُنشئ الفئة المجردة
+        super().__init__(title, author)
+        self._isbn = isbn  # تخزين رقم الكتاب الدولي
+        self._category = category  # تخزين الفئة (مثل: ديني، رواية، الخ)
+    
+    # خاصية للحصول على رقم الكتاب الدولي
+    @property
+    def isbn(self):
+        return self._isbn
+    
+    # خاصية للحصول على فئة الكتاب
+    @property
+    def category(self):
+        return self._category
+        
+    # تنفيذ دالة الحصول على تفاصيل الكتاب
+    @cached_render
+    def get_details(self):
+        return f"Book: {self.title} by {self.author}, ISBN: {self._isbn}, Category: {self._category}"
+    
+    # تمثيل النص للكتاب
+    @cached_render
+    def __str__(self):
+        return f"Book: {self.title} by {self.author}"
+
+    # تمثيل الكتاب بطريقة أكثر تفصيلًا
+    @cached_render
+    def __repr__(self):
+        return f"Book('{self.title}', '{self.author}', '{self._isbn}', '{self._category}')"
+
+# فئة EBook تمثل الكتاب الإلكتروني، وهي تورث من فئة Book
+class EBook(Book):
+    __slots__ = ("_file_size",)
+
+    def __init__(self, title, author, isbn, category, file_size):
+        # استدعاء مُنشئ فئة الكتاب
+        super().__init__(title, author, isbn, category)
+        self._file_size = file_size  # تخزين حجم الملف بالميجابايت
+    
+    # خاصية للحصول على حجم الملف
+    @property
+    def file_size(self):
+        return self._file_size
+    
+    # تنفيذ دالة الحصول على تفاصيل الكتاب الإلكتروني
+    @cached_render
+    def get_details(self):
+        return f"EBook: {self.title} by {self.author}, ISBN: {self._isbn}, Category: {self._category}, File Size: {self._file_size}MB"
+    
+    # تمثيل النص للكتاب الإلكتروني
+    @cached_render
+    def __str__(self):
+        return f"EBook: {self.title} by {self.author}"
+
+# فئة BookTable تخزن عددًا كبيرًا من الكتب في أعمدة بدلًا من كائن لكل كتاب
+# المؤلفون والفئات وأحجام الملفات (قيم متكررة) تحفظ مرة واحدة في مجمع (pool) والأعمدة تحتوي على أرقامها فقط
+# والعناوين وأرقام ISBN (قيم مختلفة غالبًا) تحفظ كنص UTF-8 متصل مع جدول لنهاية كل قيمة
+# table[i] ينشئ كائن Book أو EBook عند الوصول إليه فقط، لذلك تمثيله النصي مطابق تمامًا للكائنات العادية
+class BookTable(Sequence):
+    def __init__(self, books=()):
+        self._titles = bytearray()
+        self._title_ends = array("Q")
+        self._isbns = bytearray()
+        self._isbn_ends = array("Q")
+        self._authors = array("I")
+        self._categories = array("I")
+        self._sizes = array("I")
+        self._ebooks = bytearray()  # 1 للكتاب الإلكتروني و 0 للكتاب العادي
+        self._pool = []  # القيم المشتركة
+        self._pool_ids = {}  # (نوع القيمة، القيمة) -> رقمها في المجمع، النوع يفصل بين 5 و 5.0
+        self.extend(books)
+
+    # إضافة كتاب (Book أو EBook)
+    def append(self, book):
+        self._append(book.title, book.author, book.isbn, book.category,
+                     isinstance(book, EBook), getattr(book, "file_size", None))
+
+    def extend(self, books):
+        for book in books:
+            self.append(book)
+
+    # إضافة كتاب من قيم حقوله مباشرة بدون إنشاء كائن (مثلًا عند القراءة من ملف)
+    # يتم اعتباره كتابًا إلكترونيًا إذا تم تحديد حجم الملف
+    def append_row(self, title, author, isbn, category, file_size=None):
+        self._append(title, author, isbn, category, file_size is not None, file_size)
+
+    def _append(self, title, author, isbn, category, ebook, file_size):
+        self._titles += title.encode("utf-8", "surrogatepass")
+        self._title_ends.append(len(self._titles))
+        self._isbns += isbn.encode("utf-8", "surrogatepass")
+        self._isbn_ends.append(len(self._isbns))
+        self._authors.append(self._intern(author))
+        self._categories.append(self._intern(category))
+        self._sizes.append(self._intern(file_size))
+        self._ebooks.append(ebook)
+
+    # رقم القيمة في المجمع، مع إضافتها إذا لم تكن موجودة
+    def _intern(self, value):
+        key = (type(value), value)
+        index = self._pool_ids.get(key)
+        if index is None:
+            index = self._pool_ids[key] = len(self._pool)
+            self._pool.append(value)
+        return index
+
+    @staticmethod
+    def _text(data, ends, index):
+        return data[ends[index - 1] if index else 0:ends[index]].decode("utf-8", "surrogatepass")
+
+    def __len__(self):
+        return len(self._ebooks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("BookTable index out of range")
+        fields = (self._text(self._titles, self._title_ends, index), self._pool[self._authors[index]],
+                  self._text(self._isbns, self._isbn_ends, index), self._pool[self._categories[index]])
+        if self._ebooks[index]:
+            return EBook(*fields, self._pool[self._sizes[index]])
+        return Book(*fields)
+
+# فئة LibraryItem تمثل عنصرًا في المكتبة مع دعم لبعض العمليات مثل الوصول للعنصر وحساب طوله
+class LibraryItem:
+    def __init__(self, title, type_):
+        self.title = title
+        self.type = type_  # تحديد نوع العنصر (كتاب، كتاب إلكتروني، الخ)
+
+    # الماجيك ميثود __getitem__ للحصول على العنصر بالترتيب
+    def __getitem__(self, index):
+        return f"Item {index}: {self.title} ({self.type})"
+    
+    # الماجيك ميثود __len__ للحصول على طول اسم العنصر
+    def __len__(self):
+        return len(self.title)
+
+    # تمثيل النص للعنصر
+    def __str__(self):
+        return f"LibraryItem: {self.title} ({self.type})"
+    
+    # تمثيل العنصر بطريقة أكثر تفصيلًا
+    def __repr__(self):
+        return f"LibraryItem('{self.title}', '{self.type}')"
+
+# أسماء حقول الكتاب في تنسيقات CSV و JSON Lines
+BOOK_FIELDS = ("type", "title", "author", "isbn", "category", "file_size")
+
+# تحويل الكتاب إلى قاموس من الحقول (يستخدم في تنسيقات CSV و JSON Lines)
+def book_record(book):
+    return {
+        "type": type(book).__name__,
+        "title": book.title,
+        "author": book.author,
+        "isbn": book.isbn,
+        "category": book.category,
+        "file_size": getattr(book, "file_size", None),
+    }
+
+# تحويل النص الناتج من str لعدد إلى int أو float مع الحفاظ على نوعه الأصلي
+# (str لعدد صحيح يقبله int دائمًا، أما str لعدد عشري مثل 5e-05 أو 2e+20 أو inf فلا يقبله إلا float)
+def _parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
@@ -0,0 +1,72 @@
+# توصيات "القراء استعاروا أيضًا"
+from collections import Counter
+import heapq
+import math
+import threading
+
+# فئة Recommender تبني توصيات "القراء استعاروا أيضًا" من التقييمات والإعارات
+# مصفوفة المستخدمين والكتب محفوظة كمصفوفة متفرقة (قاموس لكل صف) ووزن كل خانة هو التقييم،
+# أو borrow_weight إذا استعار المستخدم الكتاب بدون تقييمه
+# التشابه بين كتابين هو تشابه جيب التمام (cosine) بين عمودي المصفوفة، ويتم تحديث حاصل الضرب
+# الداخلي لكل زوج من الكتب تدريجيًا مع كل حدث (بتكلفة عدد كتب المستخدم فقط)
+# وأقرب k كتب لكل كتاب تحسب عند الطلب وتحفظ حتى يتغير صف هذا الكتاب
+class Recommender:
+    def __init__(self, k=10, borrow_weight=1.0):
+        self.k = k
+        self.borrow_weight = borrow_weight
+        self._user_items = {}  # المستخدم -> {ISBN: الوزن}
+        self._norms = Counter()  # ISBN -> مجموع مربعات أوزان العمود
+        self._dots = {}  # ISBN -> {ISBN آخر: حاصل الضرب الداخلي للعمودين}
+        self._neighbors = {}  # ISBN -> أقرب k كتب [(التشابه، ISBN)]
+        self._lock = threading.Lock()
+
+    # تغيير وزن خانة في المصفوفة وتحديث حواصل الضرب المتأثرة
+    # keep_higher=True يعني عدم تقليل وزن موجود أعلى (يتم المقارنة والتغيير تحت نفس القفل)
+    def _set_weight(self, user_id, isbn, weight, keep_higher=False):
+        with self._lock:
+            items = self._user_items.setdefault(user_id, {})
+            old = items.get(isbn, 0.0)
+            if keep_higher:
+                weight = max(old, weight)
+            if weight == old:
+                return
+            change = weight - old
+            row = self._dots.setdefault(isbn, {})
+            for other, other_weight in items.items():
+                if other != isbn:
+                    row[other] = row.get(other, 0.0) + change * other_weight
+                    self._dots.setdefault(other, {})[isbn] = row[other]
+            self._norms[isbn] += weight * weight - old * old
+            items[isbn] = weight
+            # تغير العمود يغير تشابهه مع كل كتاب له حاصل ضرب معه، وليس فقط كتب هذا المستخدم
+            self._neighbors.pop(isbn, None)
+            for other in row:
+                self._neighbors.pop(other, None)
+
+    # تسجيل إعارة (لا تقلل من تقييم سابق أعلى)
+    def record_borrow(self, user_id, isbn):
+        self._set_weight(user_id, isbn, self.borrow_weight, keep_higher=True)
+
+    def record_rating(self, user_id, isbn, rating):
+        self._set_weight(user_id, isbn, float(rating))
+
+    # أقرب k كتب للكتاب [(التشابه، ISBN)] مرتبة من الأعلى
+    def similar(self, isbn):
+        neighbors = self._neighbors.get(isbn)
+        if neighbors is None:
+            with self._lock:
+                norm = math.sqrt(self._norms[isbn]) or 1.0
+                scores = ((dot / (norm * (math.sqrt(self._norms[other]) or 1.0)), other)
+                          for other, dot in self._dots.get(isbn, {}).items() if dot > 0)
+                neighbors = self._neighbors[isbn] = heapq.nlargest(self.k, scores)
+        return neighbors
+
+    # أفضل الكتب للمستخدم من جيران الكتب التي قرأها (بدون الكتب التي قرأها بالفعل)
+    def recommend(self, user_id, limit=10):
+        items = self._user_items.get(user_id, {})
+        scores = Counter()
+        for isbn, weight in list(items.items()):
+            for similarity, other in self.similar(isbn):
+                if other not in items:
+                    scores[other] += similarity * weight
+        return [isbn for isbn, _ in scores.most_common(limit)]
@@ -0,0 +1,98 @@
+# التقارير: كتابة قوائم الكتب بتنسيق نصي أو CSV أو JSON Lines، و LibraryManager
+from collections import deque
+from itertools import islice
+import os
+import sys
+
+from .catalog import Library
+from .instrumentation import metrics
+from .items import BOOK_FIELDS, book_record
+
+# تنسيق مجموعة من الكتب كنص واحد (دالة على مستوى الوحدة لكي تعمل داخل عمليات منفصلة)
+def _format_shard(fmt, books):
+    import csv
+    import io
+    import json
+    if fmt == "text":
+        return "".join(f"{book.get_details()}\n" for book in books)
+    if fmt == "jsonl":
+        return "".join(f"{json.dumps(book_record(book), ensure_ascii=False)}\n" for book in books)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(book_record(book).values() for book in books)
+    return buffer.getvalue()
+
+# مثل executor.map مع الحفاظ على الترتيب، لكن لا يتم إرسال أكثر من window مهمة في نفس الوقت
+# (executor.map يقرأ المدخلات كلها ويرسلها مسبقًا، فيتم تحميل الملف أو الكتالوج كله في الذاكرة)
+def _bounded_map(executor, function, items, window):
+    pending = deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(function, *item))
+    while pending:
+        yield pending.popleft().result()
+
+# فئة ReportRenderer تكتب التقارير على دفعات بدلًا من استدعاء print لكل سطر
+# يتم تنسيق الكتب باستخدام المولدات (generators) وكتابة كل دفعة مرة واحدة في الملف
+class ReportRenderer:
+    formats = ("text", "csv", "jsonl")
+
+    def __init__(self, sink=None, fmt="text", chunk_size=1000):
+        if fmt not in self.formats:
+            raise ValueError(f"Unsupported report format: {fmt}")
+        self.sink = sink if sink is not None else sys.stdout
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+
+    # تقسيم الكتب إلى دفعات بدون تحميلها كلها في الذاكرة
+    def _chunks(self, books, size):
+        books = iter(books)
+        while chunk := list(islice(books, size)):
+            yield chunk
+
+    # كتابة سطر أسماء الأعمدة في تنسيق CSV
+    def _write_header(self):
+        if self.fmt == "csv":
+            import csv
+            csv.writer(self.sink).writerow(BOOK_FIELDS)
+
+    # كتابة التقرير في نفس العملية
+    def write(self, books):
+        self._write_header()
+        for chunk in self._chunks(books, self.chunk_size):
+            self.sink.write(_format_shard(self.fmt, chunk))
+
+    # كتابة التقرير مع تنسيق الدفعات في عمليات منفصلة (مع الحفاظ على الترتيب)
+    def write_parallel(self, books, processes=None, shard_size=10000):
+        from concurrent.futures import ProcessPoolExecutor
+        processes = processes or os.cpu_count()
+        self._write_header()
+        with ProcessPoolExecutor(processes) as executor:
+            shards = ((self.fmt, shard) for shard in self._chunks(books, shard_size))
+            for text in _bounded_map(executor, _format_shard, shards, 2 * processes):
+                self.sink.write(text)
+
+# فئة LibraryManager تدير المكتبة وتوفر وظائف مثل عرض الكتب والعدد الإجمالي لها
+class LibraryManager:
+    # عرض الكتب في أي ملف قابل للكتابة (الافتراضي هو الشاشة) بالتنسيق المطلوب
+    @staticmethod
+    @metrics.instrument("list_books")
+    def list_books(sink=None, fmt="text"):
+        books = Library.snapshot().books
+        if books:
+            ReportRenderer(sink, fmt).write(books)
+        else:
+            print("No books available.", file=sink)
+    
+    # عدد الكتب (الكلي أو حسب النوع والفئة والمؤلف) من الأعداد المحفوظة في المكتبة
+    @staticmethod
+    def total_books(kind=None, category=None, author=None):
+        return Library.count(kind, category, author)
+    
+    # صفحة من الكتب بالترتيب المطلوب، مع المؤشر (cursor) الذي يستخدم لطلب الصفحة التالية
+    # المؤشر هو None عند الوصول إلى آخر صفحة
+    @staticmethod
+    def page_books(limit=50, after=None, kind=None, category=None, author=None, order_by="title"):
+        books = list(islice(Library.iter_books(kind, category, author, order_by, after), limit + 1))
+        cursor = Library.sort_key(books[limit - 1], order_by) if len(books) > limit else None
+        return books[:limit], cursor
@@ -0,0 +1,108 @@
+# البحث النصي في عناوين الكتب وأسماء المؤلفين
+from collections import Counter
+import heapq
+import math
+
+from .sortedkeys import SortedKeys
+
+# فئة CatalogSearchIndex تمثل فهرسًا مقلوبًا (inverted index) للبحث في العناوين وأسماء المؤلفين
+# يدعم النصوص العربية واللاتينية، والبحث ببادئة الكلمة، والبحث التقريبي (خطأ حرف واحد)،
+# وترتيب النتائج باستخدام BM25
+class CatalogSearchIndex:
+    k1 = 1.5
+    b = 0.75
+    _arabic_letters = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه"})
+    # التعبيرات النمطية (التشكيل والتطويل في النصوص العربية، والكلمات) يتم تجهيزها عند أول استخدام
+    _arabic_marks = None
+    _word = None
+
+    def __init__(self):
+        self._postings = {}  # الكلمة -> {ISBN: عدد مرات ظهورها}
+        self._lengths = {}  # ISBN -> عدد كلمات الكتاب
+        self._books = {}  # ISBN -> الكتاب
+        self._terms = SortedKeys()  # جميع الكلمات مرتبة (للبحث بالبادئة)
+        self._deletes = {}  # الكلمة بعد حذف حرف منها -> الكلمات الأصلية (للبحث التقريبي)
+        self._total_length = 0
+
+    # تقسيم النص إلى كلمات موحدة الشكل
+    @classmethod
+    def tokenize(cls, text):
+        if cls._word is None:
+            import re
+            cls._arabic_marks = re.compile("[\u064B-\u0652\u0640]")
+            cls._word = re.compile(r"\w+")
+        import unicodedata
+        text = unicodedata.normalize("NFKC", text).casefold()
+        text = cls._arabic_marks.sub("", text).translate(cls._arabic_letters)
+        return cls._word.findall(text)
+
+    @staticmethod
+    def _delete_variants(term):
+        return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+    # إضافة كتاب إلى الفهرس
+    def add(self, book):
+        if book.isbn in self._books:
+            self.remove(self._books[book.isbn])
+        tokens = self.tokenize(f"{book.title} {book.author}")
+        self._books[book.isbn] = book
+        self._lengths[book.isbn] = len(tokens)
+        self._total_length += len(tokens)
+        for term, count in Counter(tokens).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._terms.add(term)
+                for variant in self._delete_variants(term):
+                    self._deletes.setdefault(variant, set()).add(term)
+            postings[book.isbn] = count
+
+    # حذف كتاب من الفهرس
+    def remove(self, book):
+        if self._books.get(book.isbn) is not book:
+            return
+        del self._books[book.isbn]
+        self._total_length -= self._lengths.pop(book.isbn)
+        for term in set(self.tokenize(f"{book.title} {book.author}")):
+            postings = self._postings[term]
+            del postings[book.isbn]
+            if not postings:
+                del self._postings[term]
+                self._terms.remove(term)
+                for variant in self._delete_variants(term):
+                    self._deletes[variant].discard(term)
+                    if not self._deletes[variant]:
+                        del self._deletes[variant]
+
+    # الكلمات المطابقة لكلمة البحث
+    def _expand(self, token, prefix, fuzzy):
+        terms = {token} if token in self._postings else set()
+        if prefix:
+            for term in self._terms.irange(token):
+                if not term.startswith(token):
+                    break
+                terms.add(term)
+        if fuzzy:
+            # كلمتان بينهما خطأ حرف واحد تشتركان في صيغة بعد حذف حرف من إحداهما أو كلتيهما
+            for variant in self._delete_variants(token) | {token}:
+                terms.update(self._deletes.get(variant, ()))
+                if variant in self._postings:
+                    terms.add(variant)
+        return terms
+
+    # البحث وإرجاع أفضل الكتب مرتبة حسب درجة BM25
+    def search(self, query, limit=10, prefix=False, fuzzy=False):
+        if not self._books:
+            return []
+        count = len(self._books)
+        average_length = self._total_length / count
+        scores = {}
+        for token in self.tokenize(query):
+            for term in self._expand(token, prefix, fuzzy):
+                postings = self._postings[term]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for isbn, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._lengths[isbn] / average_length)
+                    scores[isbn] = scores.get(isbn, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [self._books[isbn] for isbn, _ in best]
@@ -0,0 +1,129 @@
+# توزيع الكتب والفروع على عدة عمليات (ShardedLibrary)
+import os
+import zlib
+
+from .circulation import Branch
+
+# الدالة التي تعمل داخل كل عملية (shard) وتحتفظ بجزء من الكتب والفروع
+# تستقبل الأوامر من خلال الاتصال (Pipe) وترسل النتيجة لكل أمر
+# إذا فشل أمر يتم إرسال الخطأ بدلًا من النتيجة وتستمر العملية في العمل (فلا تضيع بياناتها)
+# مخزن الفروع وفهرس التوفر وسجل الأحداث تخص العملية الرئيسية، وعند إنشاء العملية بـ fork
+# يتم نسخها معها (مع اتصال SQLite وملف السجل المفتوح) لذلك يتم إلغاؤها داخل العملية
+def _shard_worker(connection):
+    Branch.store = None
+    Branch.availability_index = None
+    Branch.event_log = None
+    books = {}  # ISBN -> الكتاب
+    branches = {}  # اسم الفرع -> الفرع
+    while (command := connection.recv()) is not None:
+        name, *args = command
+        try:
+            result = _shard_command(books, branches, name, args)
+        except Exception as error:
+            result = error
+        try:
+            connection.send(result)
+        except Exception as error:  # نتيجة لا يمكن تحويلها بـ pickle
+            connection.send(RuntimeError(f"Shard result could not be sent: {error!r}"))
+
+# تنفيذ أمر واحد على بيانات العملية
+def _shard_command(books, branches, name, args):
+    if name == "add_books":
+        for book in args[0]:
+            books[book.isbn] = book
+    elif name == "add_branch":
+        branches[args[0]] = Branch(*args)
+    elif name == "add_copies":
+        branch = branches.get(args[0])
+        if branch is None:
+            raise KeyError(f"Unknown branch: {args[0]}")
+        for book in args[1]:
+            branch.add_book(book)
+    elif name == "total_books":
+        return len(books)
+    elif name == "list_books":
+        return list(books.values())
+    elif name == "copies":
+        return {branch_name: branch.books[args[0]]
+                for branch_name, branch in branches.items() if branch.books[args[0]]}
+    else:
+        raise ValueError(f"Unknown shard command: {name}")
+
+# فئة ShardedLibrary توزع كتب المكتبة وفروعها على عدة عمليات
+# الكتب توزع حسب ISBN ومخزون كل فرع يوجد بالكامل في عملية واحدة حسب اسم الفرع
+# والاستعلامات التي تحتاج كل الأجزاء ترسل للعمليات معًا ثم تدمج نتائجها
+class ShardedLibrary:
+    def __init__(self, shards=None):
+        import multiprocessing
+        self._connections = []
+        self._processes = []
+        for _ in range(shards or os.cpu_count()):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child,), daemon=True)
+            process.start()
+            self._connections.append(parent)
+            self._processes.append(process)
+
+    # رقم العملية المسؤولة عن المفتاح (ثابت بين التشغيلات بعكس hash)
+    def _shard(self, key):
+        return zlib.crc32(key.encode("utf-8")) % len(self._connections)
+
+    # إرسال أوامر لعدة عمليات ثم انتظار نتائجها (تعمل العمليات بالتوازي)
+    def _call(self, commands):
+        for shard, command in commands.items():
+            self._connections[shard].send(command)
+        results = {shard: self._connections[shard].recv() for shard in commands}
+        for result in results.values():
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def _broadcast(self, *command):
+        return self._call({shard: command for shard in range(len(self._connections))}).values()
+
+    # إضافة مجموعة من الكتب (رسالة واحدة لكل عملية)
+    def add_books(self, books):
+        groups = {}
+        for book in books:
+            groups.setdefault(self._shard(book.isbn), []).append(book)
+        self._call({shard: ("add_books", group) for shard, group in groups.items()})
+
+    def add_book(self, book):
+        self.add_books([book])
+
+    def add_branch(self, name, location):
+        self._call({self._shard(name): ("add_branch", name, location)})
+
+    # إضافة نسخ من الكتب إلى فرع
+    def add_copies(self, branch_name, books):
+        self._call({self._shard(branch_name): ("add_copies", branch_name, list(books))})
+
+    def total_books(self):
+        return sum(self._broadcast("total_books"))
+
+    def list_books(self):
+        return [book for books in self._broadcast("list_books") for book in books]
+
+    # عدد النسخ المتاحة من الكتاب في كل فرع
+    def availability(self, isbn):
+        copies = {}
+        for result in self._broadcast("copies", isbn):
+            copies.update(result)
+        return copies
+
+    def is_available(self, branch_name, isbn):
+        shard = self._shard(branch_name)
+        return self._call({shard: ("copies", isbn)})[shard].get(branch_name, 0) > 0
+
+    # إيقاف العمليات
+    def close(self):
+        for connection in self._connections:
+            connection.send(None)
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
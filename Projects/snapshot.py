@@ -0,0 +1,147 @@
+# لقطة ثنائية لكتب وفروع المكتبة تقرأ باستخدام mmap
+import mmap
+import struct
+
+from .circulation import Branch
+from .items import Book, EBook, _parse_number
+
+# فئة LibrarySnapshot تمثل لقطة ثنائية لكتب وفروع المكتبة
+# يتم فتح الملف باستخدام mmap ولا يتم إنشاء كائن الكتاب إلا عند الوصول إليه
+#
+# تنسيق الملف:
+#   الترويسة: "LIBS" + رقم الإصدار + عدد الكتب + عدد الفروع
+#   جدول مواقع سجلات الكتب (عدد الكتب + 1) ثم جدول مواقع سجلات الفروع (عدد الفروع + 1)
+#   ثم جدول مواقع أرقام ISBN مرتبة (عدد الكتب + 1) ورقم الكتاب المقابل لكل منها (4 بايت لكل كتاب)
+#   السجلات: سجلات الكتب ثم الفروع (حقول نصية UTF-8 مفصولة بالحرف \x1f) ثم أرقام ISBN المرتبة
+#     الكتاب: العنوان، المؤلف، ISBN، الفئة، [حجم الملف للكتاب الإلكتروني]
+#     الفرع: الاسم، المكان، الإحداثيات (مفصولة بفاصلة، أو فارغة)، ثم أزواج (رقم الكتاب في الجدول، عدد النسخ)
+class LibrarySnapshot:
+    MAGIC = b"LIBS"
+    VERSION = 3
+    _header = struct.Struct("<4sHII")
+    _offset = struct.Struct("<Q")
+    _position = struct.Struct("<I")
+    _separator = "\x1f"
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._book_count, self._branch_count = self._header.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a library snapshot")
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        self._books_table = self._header.size
+        self._branches_table = self._books_table + (self._book_count + 1) * self._offset.size
+        self._isbns_table = self._branches_table + (self._branch_count + 1) * self._offset.size
+        self._positions_table = self._isbns_table + (self._book_count + 1) * self._offset.size
+        self._books = {}  # الكتب التي تم إنشاؤها بالفعل حسب موقعها في الجدول
+
+    # كتابة ملف اللقطة
+    @classmethod
+    def write(cls, path, books, branches):
+        books = list(books)
+        positions = {id(book): index for index, book in enumerate(books)}
+        for branch in branches:
+            for book in branch._titles.values():
+                if id(book) not in positions:
+                    positions[id(book)] = len(books)
+                    books.append(book)
+        order = sorted(range(len(books)), key=lambda index: (books[index].isbn, index))
+        tables = ([cls._encode_book(book) for book in books],
+                  [cls._encode_branch(branch, positions) for branch in branches],
+                  [books[index].isbn.encode("utf-8") for index in order])
+        offset = (cls._header.size + sum(len(records) + 1 for records in tables) * cls._offset.size
+                  + len(order) * cls._position.size)
+        with open(path, "wb") as file:
+            file.write(cls._header.pack(cls.MAGIC, cls.VERSION, len(books), len(branches)))
+            for records in tables:
+                for record in records:
+                    file.write(cls._offset.pack(offset))
+                    offset += len(record)
+                file.write(cls._offset.pack(offset))
+            file.write(b"".join(map(cls._position.pack, order)))
+            for records in tables:
+                file.writelines(records)
+
+    @classmethod
+    def _encode_book(cls, book):
+        fields = [book.title, book.author, book.isbn, book.category]
+        if isinstance(book, EBook):
+            fields.append(str(book.file_size))
+        return cls._separator.join(fields).encode("utf-8")
+
+    @classmethod
+    def _encode_branch(cls, branch, positions):
+        coordinates = "" if branch.coordinates is None else ",".join(map(str, branch.coordinates))
+        fields = [branch.name, branch.location, coordinates]
+        for isbn, count in branch.books.items():
+            fields.append(str(positions[id(branch._titles[isbn])]))
+            fields.append(str(count))
+        return cls._separator.join(fields).encode("utf-8")
+
+    # قراءة السجل رقم index من الجدول الذي يبدأ عند table
+    def _record(self, table, index):
+        start, end = struct.unpack_from("<QQ", self._mmap, table + index * self._offset.size)
+        return self._mmap[start:end]
+
+    def _fields(self, table, index):
+        return self._record(table, index).decode("utf-8").split(self._separator)
+
+    # البحث عن كتاب حسب ISBN بالبحث الثنائي في جدول ISBN المرتب (يتم قراءة log(n) رقمًا فقط)
+    def find_by_isbn(self, isbn):
+        key = isbn.encode("utf-8")
+        low, high = 0, self._book_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(self._isbns_table, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._book_count or self._record(self._isbns_table, low) != key:
+            return None
+        return self[self._position.unpack_from(self._mmap, self._positions_table + low * self._position.size)[0]]
+
+    # عدد الكتب في اللقطة
+    def __len__(self):
+        return self._book_count
+
+    # الحصول على الكتاب رقم index (يتم إنشاؤه عند أول وصول فقط)
+    def __getitem__(self, index):
+        if not 0 <= index < self._book_count:
+            raise IndexError("snapshot book index out of range")
+        book = self._books.get(index)
+        if book is None:
+            fields = self._fields(self._books_table, index)
+            if len(fields) == 5:
+                book = EBook(*fields[:4], _parse_number(fields[4]))
+            else:
+                book = Book(*fields)
+            self._books[index] = book
+        return book
+
+    # المرور على جميع الكتب
+    def books(self):
+        for index in range(self._book_count):
+            yield self[index]
+
+    # المرور على الفروع مع مخزونها من الكتب
+    def branches(self):
+        for index in range(self._branch_count):
+            name, location, coordinates, *inventory = self._fields(self._branches_table, index)
+            if coordinates:
+                coordinates = tuple(_parse_number(value) for value in coordinates.split(","))
+            branch = Branch(name, location, coordinates or None)
+            for position, count in zip(inventory[::2], inventory[1::2]):
+                branch.restore(self[int(position)], int(count))
+            yield branch
+
+    # إغلاق الملف
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,97 @@
+# قائمة مفاتيح مرتبة مقسمة إلى كتل، تستخدمها فهارس الكتالوج وفهرس البحث
+# استيراد دوال البحث الثنائي للحفاظ على الفهارس مرتبة
+from bisect import bisect_left, bisect_right, insort
+import threading
+
+# فئة SortedKeys تمثل قائمة مرتبة من مفاتيح مختلفة مقسمة إلى كتل (كل كتلة قائمة مرتبة صغيرة)
+# الإضافة والحذف يغيران كتلة واحدة فقط، لذلك تكلفتهما O(log n + load) بدلًا من O(n)
+# عند استخدام insort على قائمة واحدة كبيرة، والإضافة المجمعة (update) تدمج المفاتيح الجديدة مرة واحدة
+# القراءة (irange) تنسخ جزءًا صغيرًا من كتلة واحدة في كل خطوة تحت قفل قصير، فيمكن المرور على
+# المفاتيح أثناء تعديلها من خيط آخر بدون تكرار مفتاح أو تخطي مفتاح موجود
+class SortedKeys:
+    # عدد المفاتيح في الكتلة عند تقسيمها (تنقسم الكتلة عندما يتجاوز حجمها ضعف هذا العدد)
+    load = 1000
+
+    def __init__(self, keys=()):
+        self._lists = []  # الكتل المرتبة
+        self._maxes = []  # أكبر مفتاح في كل كتلة (للبحث الثنائي عن الكتلة)
+        self._length = 0
+        self._lock = threading.Lock()
+        self.update(keys)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return self.irange()
+
+    # إضافة مفتاح واحد
+    def add(self, key):
+        with self._lock:
+            self._add(key)
+
+    def _add(self, key):
+        if not self._maxes:
+            self._lists.append([key])
+            self._maxes.append(key)
+        else:
+            index = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+            block = self._lists[index]
+            insort(block, key)
+            self._maxes[index] = block[-1]
+            if len(block) > 2 * self.load:
+                self._lists[index:index + 1] = [block[:self.load], block[self.load:]]
+                self._maxes[index:index + 1] = [block[self.load - 1], block[-1]]
+        self._length += 1
+
+    # إضافة عدة مفاتيح: إذا كانت قليلة مقارنة بالموجود تضاف واحدًا واحدًا،
+    # وإلا يتم دمجها مع المفاتيح الموجودة (ترتيب Timsort لمجموعتين مرتبتين خطي تقريبًا)
+    def update(self, keys):
+        keys = sorted(keys)
+        with self._lock:
+            if len(keys) * 8 < self._length:
+                for key in keys:
+                    self._add(key)
+                return
+            keys = sorted([key for block in self._lists for key in block] + keys)
+            self._lists = [keys[start:start + self.load] for start in range(0, len(keys), self.load)]
+            self._maxes = [block[-1] for block in self._lists]
+            self._length = len(keys)
+
+    # حذف مفتاح (ValueError إذا لم يكن موجودًا)
+    def remove(self, key):
+        with self._lock:
+            index = bisect_left(self._maxes, key)
+            if index < len(self._maxes):
+                block = self._lists[index]
+                position = bisect_left(block, key)
+                if block[position] == key:
+                    del block[position]
+                    self._length -= 1
+                    if block:
+                        self._maxes[index] = block[-1]
+                    else:
+                        del self._lists[index]
+                        del self._maxes[index]
+                    return
+        raise ValueError(f"{key!r} is not in the index")
+
+    # المرور على المفاتيح بالترتيب بدءًا من start
+    # (المفاتيح الأكبر من أو تساوي start، أو الأكبر منه فقط إذا كان inclusive=False)
+    # في كل خطوة يتم نسخ بقية الكتلة الحالية ثم البحث من جديد بعد آخر مفتاح تمت قراءته
+    def irange(self, start=None, inclusive=True):
+        find = bisect_left if inclusive else bisect_right
+        while True:
+            with self._lock:
+                if not self._lists:
+                    return
+                if start is None:
+                    index, position = 0, 0
+                else:
+                    index = find(self._maxes, start)
+                    if index == len(self._maxes):
+                        return
+                    position = find(self._lists[index], start)
+                chunk = self._lists[index][position:]
+            yield from chunk
+            start, find = chunk[-1], bisect_right
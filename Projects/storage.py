@@ -0,0 +1,241 @@
+# تخزين حالة الإعارات والمدفوعات ومخزون الفروع (في الذاكرة أو في SQLite)
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+import threading
+
+# واجهة مجردة لتخزين حالة الإعارات (نفس أسلوب EmailSender و PaymentProcessor في SOLID.py)
+# يتم تسجيل التغييرات كفروق (delta) في عدد النسخ بدلًا من حفظ الحالة كاملة بعد كل تغيير
+class CirculationStore(ABC):
+    @abstractmethod
+    def record_loan(self, customer_id, isbn, delta):
+        pass
+
+    @abstractmethod
+    def record_payment(self, customer_id, amount):
+        pass
+
+    @abstractmethod
+    def record_inventory(self, branch_name, isbn, delta):
+        pass
+
+    @abstractmethod
+    def load_loans(self, customer_id):
+        pass
+
+    @abstractmethod
+    def load_payments(self, customer_id):
+        pass
+
+    @abstractmethod
+    def load_inventory(self, branch_name):
+        pass
+
+    # كتابة التغييرات المؤجلة (إن وجدت)
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+# مخزن في الذاكرة (للاختبارات أو عندما لا نحتاج إلى الحفظ بعد إغلاق البرنامج)
+class InMemoryCirculationStore(CirculationStore):
+    def __init__(self):
+        self._loans = {}  # معرف العميل -> Counter
+        self._payments = {}  # معرف العميل -> قائمة المدفوعات
+        self._inventory = {}  # اسم الفرع -> Counter
+        self._lock = threading.Lock()
+
+    def _apply(self, table, key, isbn, delta):
+        with self._lock:
+            counts = table.setdefault(key, Counter())
+            counts[isbn] += delta
+            if counts[isbn] <= 0:
+                del counts[isbn]
+
+    def record_loan(self, customer_id, isbn, delta):
+        self._apply(self._loans, customer_id, isbn, delta)
+
+    def record_payment(self, customer_id, amount):
+        with self._lock:
+            self._payments.setdefault(customer_id, []).append(amount)
+
+    def record_inventory(self, branch_name, isbn, delta):
+        self._apply(self._inventory, branch_name, isbn, delta)
+
+    def load_loans(self, customer_id):
+        return Counter(self._loans.get(customer_id, ()))
+
+    def load_payments(self, customer_id):
+        return list(self._payments.get(customer_id, ()))
+
+    def load_inventory(self, branch_name):
+        return Counter(self._inventory.get(branch_name, ()))
+
+# مخزن SQLite مع تأجيل الكتابة (write-behind): يتم تجميع التغييرات في الذاكرة وكتابتها
+# في معاملة واحدة باستخدام executemany عند امتلاء الدفعة أو عند flush أو قبل أي قراءة،
+# وأيضًا كل flush_interval ثانية من خيط في الخلفية وعند خروج البرنامج (atexit) حتى بدون close
+# batch_size=1 يعني كتابة كل تغيير مباشرة (للمقارنة)، و flush_interval=None يلغي الكتابة الدورية
+# الاتصالات محفوظة في مجموعة محدودة (pool) وقاعدة البيانات تعمل بوضع WAL
+# القراءة ترى كل التغييرات المسجلة قبلها، حتى الدفعات التي تكتبها خيوط أخرى في نفس اللحظة
+# وبعد close يرفض المخزن أي تسجيل أو قراءة جديدة (ValueError)
+class SQLiteCirculationStore(CirculationStore):
+    _schema = (
+        "CREATE TABLE IF NOT EXISTS loans (customer_id TEXT, isbn TEXT, copies INTEGER, PRIMARY KEY (customer_id, isbn))",
+        "CREATE TABLE IF NOT EXISTS payments (id INTEGER PRIMARY KEY, customer_id TEXT, amount REAL)",
+        "CREATE INDEX IF NOT EXISTS payments_customer ON payments (customer_id)",
+        "CREATE TABLE IF NOT EXISTS inventory (branch TEXT, isbn TEXT, copies INTEGER, PRIMARY KEY (branch, isbn))",
+    )
+    # الجمل المحضرة (prepared statements) لكل نوع من التغييرات
+    _statements = {
+        "loan": "INSERT INTO loans VALUES (?, ?, ?) "
+                "ON CONFLICT (customer_id, isbn) DO UPDATE SET copies = copies + excluded.copies",
+        "payment": "INSERT INTO payments (customer_id, amount) VALUES (?, ?)",
+        "inventory": "INSERT INTO inventory VALUES (?, ?, ?) "
+                     "ON CONFLICT (branch, isbn) DO UPDATE SET copies = copies + excluded.copies",
+    }
+
+    def __init__(self, path, batch_size=1000, pool_size=4, flush_interval=1.0):
+        import atexit
+        import queue
+        import sqlite3
+        self.batch_size = batch_size
+        self._pending = {kind: [] for kind in self._statements}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        # يتم إعلام المنتظرين عند اكتمال كتابة دفعة أو انتهاء قراءة
+        self._idle = threading.Condition(self._lock)
+        self._batches = 0  # عدد الدفعات التي تم أخذها للكتابة
+        self._writing = set()  # أرقام الدفعات التي لم تكتمل كتابتها بعد
+        self._readers = 0
+        self._pool = queue.Queue(pool_size)
+        for _ in range(pool_size):
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(connection)
+        with self._connection() as connection:
+            for statement in self._schema:
+                connection.execute(statement)
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_every, args=(flush_interval,), daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    # الكتابة الدورية للتغييرات المؤجلة حتى إغلاق المخزن
+    def _flush_every(self, interval):
+        while not self._closed.wait(interval):
+            self.flush()
+
+    # استعارة اتصال من المجموعة وإعادته بعد الاستخدام (مع commit عند النجاح)
+    @contextmanager
+    def _connection(self):
+        connection = self._pool.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._pool.put(connection)
+
+    # رفض الاستخدام بعد close (يجب استدعاؤها والقفل محجوز)
+    def _check_open(self):
+        if self._closed.is_set():
+            raise ValueError("Circulation store is closed")
+
+    def _add(self, kind, row):
+        with self._lock:
+            self._check_open()
+            self._pending[kind].append(row)
+            self._pending_count += 1
+            if self._pending_count < self.batch_size:
+                return
+            batch, pending = self._take_pending()
+        self._write(batch, pending)
+
+    # أخذ التغييرات المؤجلة كدفعة جديدة رقمها batch (يجب استدعاؤها والقفل محجوز)
+    def _take_pending(self):
+        pending = self._pending
+        self._pending = {kind: [] for kind in self._statements}
+        self._pending_count = 0
+        self._batches += 1
+        self._writing.add(self._batches)
+        return self._batches, pending
+
+    def _write(self, batch, pending):
+        try:
+            with self._connection() as connection:
+                for kind, rows in pending.items():
+                    if rows:
+                        connection.executemany(self._statements[kind], rows)
+        finally:
+            with self._lock:
+                self._writing.discard(batch)
+                self._idle.notify_all()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending_count:
+                return
+            batch, pending = self._take_pending()
+        self._write(batch, pending)
+
+    # كتابة التغييرات المؤجلة وانتظار اكتمال كل الدفعات التي أُخذت قبلها (من أي خيط)
+    def _sync(self):
+        self.flush()
+        with self._lock:
+            last = self._batches
+            while self._writing and min(self._writing) <= last:
+                self._idle.wait()
+
+    def record_loan(self, customer_id, isbn, delta):
+        self._add("loan", (customer_id, isbn, delta))
+
+    def record_payment(self, customer_id, amount):
+        self._add("payment", (customer_id, amount))
+
+    def record_inventory(self, branch_name, isbn, delta):
+        self._add("inventory", (branch_name, isbn, delta))
+
+    def _query(self, statement, key):
+        with self._lock:
+            self._check_open()
+            self._readers += 1
+        try:
+            self._sync()
+            with self._connection() as connection:
+                return connection.execute(statement, (key,)).fetchall()
+        finally:
+            with self._lock:
+                self._readers -= 1
+                self._idle.notify_all()
+
+    def load_loans(self, customer_id):
+        return Counter(dict(self._query(
+            "SELECT isbn, copies FROM loans WHERE customer_id = ? AND copies > 0", customer_id)))
+
+    def load_payments(self, customer_id):
+        rows = self._query("SELECT amount FROM payments WHERE customer_id = ? ORDER BY id", customer_id)
+        return [amount for amount, in rows]
+
+    def load_inventory(self, branch_name):
+        return Counter(dict(self._query(
+            "SELECT isbn, copies FROM inventory WHERE branch = ? AND copies > 0", branch_name)))
+
+    # إغلاق المخزن بعد كتابة كل التغييرات وانتهاء القراءات الجارية
+    def close(self):
+        import atexit
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+        atexit.unregister(self.close)
+        if self._flusher is not None:
+            self._flusher.join()
+        self._sync()
+        with self._lock:
+            while self._readers:
+                self._idle.wait()
+        while not self._pool.empty():
+            self._pool.get().close()
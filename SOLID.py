@@ -25,6 +25,9 @@ class TransactionManager:
         print(f"Total: ${self.calculate_total()}")
 
 #todo Correct example
+from itertools import islice
+import sys
+
 # Class responsible for representing financial transactions
 class Transaction:
     def __init__(self, amount, description):
@@ -35,22 +38,33 @@ class Transaction:
 class TransactionManager:
     def __init__(self):
         self.transactions = []
+        self.total = 0  # running total, updated on every add
     
     # Method to add a new transaction
     def add_transaction(self, amount, description):
         self.transactions.append(Transaction(amount, description))
+        self.total += amount
     
     # Method to calculate the total of all transactions
     def calculate_total(self):
-        return sum(transaction.amount for transaction in self.transactions)
+        return self.total
 
 # Class responsible for printing the transaction report
+# Lines are produced by a generator and written in chunks, not with one print() per line
 class ReportPrinter:
-    def print_report(self, transaction_manager):
-        print("Transaction Report:")
+    chunk_size = 1000
+
+    def print_report(self, transaction_manager, file=None):
+        file = file if file is not None else sys.stdout
+        lines = self._report_lines(transaction_manager)
+        while chunk := list(islice(lines, self.chunk_size)):
+            file.write("".join(chunk))
+
+    def _report_lines(self, transaction_manager):
+        yield "Transaction Report:\n"
         for transaction in transaction_manager.transactions:
-            print(f"{transaction.description}: ${transaction.amount}")
-        print(f"Total: ${transaction_manager.calculate_total()}")
+            yield f"{transaction.description}: ${transaction.amount}\n"
+        yield f"Total: ${transaction_manager.calculate_total()}\n"
 
 # Composite class that groups the objects together to form the system
 class TransactionSystem:
@@ -71,6 +85,63 @@ class TransactionSystem:
     def get_total(self):
         return self.manager.calculate_total()
 
+# Class responsible for keeping totals over a stream of transactions that is too large to hold.
+# Only amounts and timestamps are stored, in compact arrays, and per-description totals
+# and running (prefix) sums are updated on every append, so totals never re-scan the stream.
+from array import array
+from bisect import bisect_left
+import time
+
+
+class TransactionLedger:
+    def __init__(self):
+        self.amounts = array("d")
+        self.timestamps = array("d")
+        self._running_totals = array("d", [0.0])  # _running_totals[i] = sum of the first i amounts
+        self.by_description = {}  # description -> [count, total]
+
+    def __len__(self):
+        return len(self.amounts)
+
+    # Timestamps must not go backwards (the ledger is append-only)
+    def add_transaction(self, amount, description, timestamp=None):
+        if timestamp is None:
+            timestamp = time.time()
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            raise ValueError("Transactions must be appended in timestamp order")
+        self.amounts.append(amount)
+        self.timestamps.append(timestamp)
+        self._running_totals.append(self._running_totals[-1] + amount)
+        aggregate = self.by_description.setdefault(description, [0, 0.0])
+        aggregate[0] += 1
+        aggregate[1] += amount
+
+    # Consume (amount, description) or (amount, description, timestamp) tuples from any iterable
+    def extend(self, transactions):
+        for transaction in transactions:
+            self.add_transaction(*transaction)
+
+    # Stream "amount,description[,timestamp]" rows from a CSV file
+    def extend_from_file(self, path):
+        import csv
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.reader(file):
+                timestamp = float(row[2]) if len(row) > 2 else None
+                self.add_transaction(float(row[0]), row[1], timestamp)
+
+    def calculate_total(self):
+        return self._running_totals[-1]
+
+    def total_for(self, description):
+        return self.by_description.get(description, [0, 0.0])[1]
+
+    # Total of the transactions made in the last `seconds` (e.g. 3600 for the last hour)
+    def total_since(self, seconds, now=None):
+        if now is None:
+            now = time.time()
+        start = bisect_left(self.timestamps, now - seconds)
+        return self._running_totals[-1] - self._running_totals[start]
+
 # transaction_system = TransactionSystem()
 
 # transaction_system.add_transaction(100, "شراء منتجات")
@@ -121,6 +192,18 @@ class PaymentProcessor(ABC):
     def process_payment(self, amount):
         pass
 
+    # Process several amounts and return one error (or None) per amount.
+    # Processors with a batch API override this, and raise only if the batch is atomic
+    def process_batch(self, amounts):
+        errors = []
+        for amount in amounts:
+            try:
+                self.process_payment(amount)
+                errors.append(None)
+            except Exception as error:
+                errors.append(error)
+        return errors
+
 
 class CreditCardPaymentProcessor(PaymentProcessor):
     def process_payment(self, amount):
@@ -161,6 +244,93 @@ class PaymentService:
 # payment_service.process_payment(300)  # Valed
 
 
+#todo Settlement example
+# PaymentService handles one amount through one processor. PaymentSettlementEngine takes a
+# stream of mixed (payment_type, amount) payments, routes each one through a registry of
+# processors, groups them into micro-batches per processor and settles the batches in
+# parallel on a thread pool. New payment types are added with register(), not by editing it.
+
+
+class PaymentResult:
+    def __init__(self, index, payment_type, amount, error=None):
+        self.index = index  # position of the payment in the input stream
+        self.payment_type = payment_type
+        self.amount = amount
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f"PaymentResult({self.index}, '{self.payment_type}', {self.amount}, ok={self.ok})"
+
+
+class PaymentSettlementEngine:
+    def __init__(self, processors=None, batch_size: int = 100, max_workers: int = 4):
+        self.processors = dict(processors or {})
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.stats = {}
+
+    def register(self, payment_type: str, processor: PaymentProcessor):
+        self.processors[payment_type] = processor
+
+    # Returns one PaymentResult per payment, in input order
+    def settle(self, payments):
+        from concurrent.futures import ThreadPoolExecutor
+        started = time.perf_counter()
+        results = []
+        batches = {}
+        futures = []
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            for index, (payment_type, amount) in enumerate(payments):
+                result = PaymentResult(index, payment_type, amount)
+                results.append(result)
+                if payment_type not in self.processors:
+                    result.error = ValueError("Unsupported payment type")
+                    continue
+                batch = batches.setdefault(payment_type, [])
+                batch.append(result)
+                if len(batch) == self.batch_size:
+                    futures.append(executor.submit(self._settle_batch, batches.pop(payment_type)))
+            for batch in batches.values():
+                futures.append(executor.submit(self._settle_batch, batch))
+            latencies = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+        self.stats = {
+            "payments": len(results),
+            "failed": sum(not result.ok for result in results),
+            "batches": len(latencies),
+            "elapsed": elapsed,
+            "payments_per_second": len(results) / elapsed if elapsed else 0.0,
+            "mean_batch_latency": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_batch_latency": max(latencies, default=0.0),
+        }
+        return results
+
+    # Settles one batch and returns how long it took
+    def _settle_batch(self, batch):
+        started = time.perf_counter()
+        try:
+            errors = self.processors[batch[0].payment_type].process_batch([result.amount for result in batch])
+        except Exception as error:
+            # An atomic batch either settles completely or not at all
+            errors = [error] * len(batch)
+        for result, error in zip(batch, errors or ()):
+            result.error = error
+        return time.perf_counter() - started
+
+
+# engine = PaymentSettlementEngine({
+#     "credit_card": CreditCardPaymentProcessor(),
+#     "paypal": PayPalPaymentProcessor(),
+#     "bank_transfer": BankTransferPaymentProcessor(),
+# })
+# results = engine.settle([("credit_card", 100), ("paypal", 200), ("bank_transfer", 300)])
+# print(engine.stats)
+
+
 
 
 
@@ -399,6 +569,18 @@ class EmailSender(ABC):
     def send_email(self, to: str, subject: str, body: str):
         pass
 
+    # Send several (to, subject, body) messages and return one error (or None) per message.
+    # Providers with a batch API override this, and raise only if none of the batch was sent
+    def send_batch(self, messages):
+        errors = []
+        for to, subject, body in messages:
+            try:
+                self.send_email(to, subject, body)
+                errors.append(None)
+            except Exception as error:
+                errors.append(error)
+        return errors
+
 
 class SmtpEmailSender(EmailSender):
     def send_email(self, to: str, subject: str, body: str):
@@ -421,6 +603,178 @@ class EmailService:
         self.sender.send_email(to, subject, body)
 
 
-mailgun_sender = MailgunEmailSender()
-email_service_mailgun = EmailService(mailgun_sender)
-email_service_mailgun.send_email("example@example.com", "Mailgun Test", "This is a test email using Mailgun.")
\ No newline at end of file
+#todo Queued example
+# For bulk sends (e.g. overdue notices) EmailService delivers one message per call.
+# QueuedEmailService puts messages on a bounded queue (send_email blocks when it is full)
+# and a pool of workers drains it in batches. Each worker gets its own sender from
+# sender_factory and reuses it for every batch. Messages that failed are retried with jitter,
+# and messages that were already delivered are not sent again.
+import queue
+import random
+import threading
+
+
+class QueuedEmailService:
+    def __init__(self, sender_factory, workers: int = 4, max_queue: int = 10000,
+                 batch_size: int = 50, max_retries: int = 3, retry_delay: float = 0.1):
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.sent = 0
+        self.failed = 0
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._workers = [
+            threading.Thread(target=self._work, args=(sender_factory(),), daemon=True)
+            for _ in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def send_email(self, to: str, subject: str, body: str):
+        self._queue.put((to, subject, body))
+
+    # Wait until all queued messages are delivered, then stop the workers
+    def close(self):
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def messages_per_second(self):
+        return self.sent / (time.perf_counter() - self._started)
+
+    # Each worker stops after taking exactly one None (put there by close)
+    def _work(self, sender: EmailSender):
+        running = True
+        while running:
+            batch = []
+            message = self._queue.get()
+            while message is not None:
+                batch.append(message)
+                if len(batch) == self.batch_size:
+                    break
+                try:
+                    message = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            running = message is not None
+            if batch:
+                self._deliver(sender, batch)
+
+    def _deliver(self, sender: EmailSender, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                errors = sender.send_batch(batch)
+            except Exception as error:
+                errors = [error] * len(batch)
+            failed = [message for message, error in zip(batch, errors or ()) if error is not None]
+            with self._lock:
+                self.sent += len(batch) - len(failed)
+            batch = failed
+            if not batch:
+                return
+            if attempt < self.max_retries:
+                time.sleep(self.retry_delay * 2 ** attempt * random.uniform(0.5, 1.5))
+        with self._lock:
+            self.failed += len(batch)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# with QueuedEmailService(SmtpEmailSender, workers=8) as email_service:
+#     for i in range(500000):
+#         email_service.send_email(f"user{i}@example.com", "Overdue notice", "Please return your books.")
+# print(f"{email_service.messages_per_second():.0f} messages/s")
+
+
+#todo Async example
+# The same abstractions, for services that run many sessions on one event loop.
+# Slow backends (payment gateways, mail senders) are awaited concurrently,
+# but a semaphore bounds how many calls are in flight at once.
+# asyncio is imported inside the methods, so importing this file does not pay for it.
+
+
+class AsyncPaymentProcessor(ABC):
+    @abstractmethod
+    async def process_payment(self, amount):
+        pass
+
+
+class AsyncEmailSender(ABC):
+    @abstractmethod
+    async def send_email(self, to: str, subject: str, body: str):
+        pass
+
+
+# Local fake backends with configurable latency, for measuring throughput offline
+class FakePaymentProcessor(AsyncPaymentProcessor):
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.processed = 0
+
+    async def process_payment(self, amount):
+        import asyncio
+        await asyncio.sleep(self.latency)
+        self.processed += 1
+
+
+class FakeEmailSender(AsyncEmailSender):
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.sent = 0
+
+    async def send_email(self, to: str, subject: str, body: str):
+        import asyncio
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+
+
+class AsyncPaymentService:
+    # Accepts an AsyncPaymentProcessor, or a blocking PaymentProcessor which is run in a thread
+    def __init__(self, payment_processor, max_concurrency: int = 100):
+        import asyncio
+        self.payment_processor = payment_processor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def process_payment(self, amount: float):
+        import asyncio
+        async with self._semaphore:
+            if isinstance(self.payment_processor, AsyncPaymentProcessor):
+                await self.payment_processor.process_payment(amount)
+            else:
+                await asyncio.to_thread(self.payment_processor.process_payment, amount)
+
+
+class AsyncEmailService:
+    # Accepts an AsyncEmailSender, or a blocking EmailSender which is run in a thread
+    def __init__(self, sender, max_concurrency: int = 100):
+        import asyncio
+        self.sender = sender
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def send_email(self, to: str, subject: str, body: str):
+        import asyncio
+        async with self._semaphore:
+            if isinstance(self.sender, AsyncEmailSender):
+                await self.sender.send_email(to, subject, body)
+            else:
+                await asyncio.to_thread(self.sender.send_email, to, subject, body)
+
+
+# async def main():
+#     email_service = AsyncEmailService(FakeEmailSender(latency=0.1), max_concurrency=500)
+#     await asyncio.gather(*(email_service.send_email(f"user{i}@example.com", "Notice", "...") for i in range(5000)))
+#
+# import asyncio
+# asyncio.run(main())
+
+
+# mailgun_sender = MailgunEmailSender()
+# email_service_mailgun = EmailService(mailgun_sender)
+# email_service_mailgun.send_email("example@example.com", "Mailgun Test", "This is a test email using Mailgun.")
\ No newline at end of file
@@ -0,0 +1,774 @@
+# Benchmark suite for the Projects package (through Projects/Library.py) and SOLID.py
+"""
+Runs the core operations of both modules on synthetic data at several scales and
+reports the best wall time and the peak traced memory of each benchmark.
+
+    python benchmarks.py                                 # run every benchmark at the "small" scale
+    python benchmarks.py --scale medium --only library   # benchmarks whose name contains "library"
+    python benchmarks.py --save-baseline baseline.json   # store the results
+    python benchmarks.py --baseline baseline.json        # compare, exit code 1 on regressions
+    python benchmarks.py --scale 1m --only lookup        # indexed lookups against a list scan at 1M books
+
+Each benchmark is a setup function that builds its data and returns a zero-argument
+callable; only the callable is timed. A callable may instead return its own measurement in
+seconds (the startup benchmarks report the cumulative module time from -X importtime).
+A callable with an `operations` attribute also gets a throughput column (operations/s).
+Data is generated from a fixed seed so runs are reproducible.
+"""
+import argparse
+import contextlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import io
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "Projects"))
+
+import Library as library
+import SOLID as solid
+
+SCALES = {"small": 1_000, "medium": 10_000, "large": 100_000, "1m": 1_000_000, "5m": 5_000_000}
+SEED = 2024
+BENCHMARKS = {}
+CLEANUP = []  # callbacks that release what the current benchmark created (directories, processes)
+
+
+def benchmark(name):
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def scratch_dir():
+    directory = tempfile.TemporaryDirectory()
+    CLEANUP.append(directory.cleanup)
+    return directory.name
+
+
+# Synthetic data generators
+
+CATEGORIES = ("Dystopian", "Thriller", "رواية", "History", "Science", "Poetry", "سيرة")
+WORDS = ("night", "river", "city", "الملح", "مدن", "garden", "empire", "silent", "machine", "الأيام",
+         "winter", "ocean", "fortress", "digital", "animal", "farm", "glass", "storm")
+AUTHORS = tuple(f"{first} {last}" for first in ("George", "Dan", "Taha", "Naguib", "Ursula", "Abdul")
+                for last in ("Orwell", "Brown", "Hussein", "Mahfouz", "Le Guin", "Munif"))
+
+
+def make_catalog(n, rng):
+    books = []
+    for i in range(n):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))) + f" {i}"
+        author = rng.choice(AUTHORS)
+        isbn = f"{9780000000000 + i}"
+        category = rng.choice(CATEGORIES)
+        if i % 3 == 0:
+            books.append(library.EBook(title, author, isbn, category, rng.randint(1, 50)))
+        else:
+            books.append(library.Book(title, author, isbn, category))
+    return books
+
+
+def make_branches(n, books, copies, rng):
+    branches = [library.Branch(f"Branch {i}", f"District {i}") for i in range(n)]
+    for book in books:
+        for _ in range(copies):
+            rng.choice(branches).add_book(book)
+    return branches
+
+
+def make_customers(n):
+    return [library.Customer(f"Customer {i}", 18 + i % 60, f"C{i:07d}") for i in range(n)]
+
+
+def transaction_stream(n, rng, start=1_700_000_000.0):
+    for i in range(n):
+        yield round(rng.uniform(-500, 500), 2), rng.choice(("deposit", "purchase", "bill", "refund")), start + i
+
+
+# Book and EBook as they were before __slots__, where every instance carries a __dict__
+class DictBook:
+    def __init__(self, title, author, isbn, category):
+        self._title = title
+        self._author = author
+        self._isbn = isbn
+        self._category = category
+
+
+class DictEBook(DictBook):
+    def __init__(self, title, author, isbn, category, file_size):
+        super().__init__(title, author, isbn, category)
+        self._file_size = file_size
+
+
+class SilentPaymentProcessor(solid.PaymentProcessor):
+    def process_payment(self, amount):
+        pass
+
+
+# Library benchmarks
+
+@benchmark("library.add_book")
+def _(n, rng):
+    books = make_catalog(n, rng)
+
+    def run():
+        catalog = library.Library()
+        for book in books:
+            catalog.add_book(book)
+    return run
+
+
+@benchmark("library.add_books")
+def _(n, rng):
+    books = make_catalog(n, rng)
+    return lambda: library.Library().add_books(books)
+
+
+def _lookup_queries(books, rng):
+    return ([book.isbn for book in rng.sample(books, min(len(books), 20))],
+            rng.sample(AUTHORS, 5), rng.sample(CATEGORIES, 5), [word[:3] for word in rng.sample(WORDS, 5)])
+
+
+@benchmark("library.lookup_indexed")
+def _(n, rng):
+    catalog = library.Library()
+    books = make_catalog(n, rng)
+    catalog.add_books(books)
+    isbns, authors, categories, prefixes = _lookup_queries(books, rng)
+
+    def run():
+        [catalog.find_by_isbn(isbn) for isbn in isbns]
+        [catalog.find_by_author(author) for author in authors]
+        [catalog.find_by_category(category) for category in categories]
+        [catalog.find_by_title_prefix(prefix) for prefix in prefixes]
+    return run
+
+
+# The same queries as library.lookup_indexed, answered by scanning the book list
+@benchmark("library.lookup_list_scan")
+def _(n, rng):
+    catalog = library.Library()
+    books = make_catalog(n, rng)
+    catalog.add_books(books)
+    isbns, authors, categories, prefixes = _lookup_queries(books, rng)
+
+    def run():
+        books = catalog.get_books()
+        [next((book for book in books if book.isbn == isbn), None) for isbn in isbns]
+        [[book for book in books if book.author == author] for author in authors]
+        [[book for book in books if book.category == category] for category in categories]
+        [sorted((book for book in books if book.title.startswith(prefix)), key=lambda book: book.title)
+         for prefix in prefixes]
+    return run
+
+
+# One tab-separated line per book. Every run splits the lines again, so each container holds
+# its own strings, as it would when loading a catalog file.
+def _memory_rows(n, rng):
+    return ["\t".join((book.title, book.author, book.isbn, book.category, str(getattr(book, "file_size", ""))))
+            for book in make_catalog(n, rng)]
+
+
+def _split_row(line):
+    title, author, isbn, category, file_size = line.split("\t")
+    return title, author, isbn, category, int(file_size) if file_size else None
+
+
+def _memory_benchmark(n, rng, book_class, ebook_class):
+    lines = _memory_rows(n, rng)
+
+    def run():
+        rows = map(_split_row, lines)
+        return [book_class(*row[:4]) if row[4] is None else ebook_class(*row) for row in rows]
+    return run
+
+
+# Compare the peak memory column of these three
+@benchmark("memory.books_slots")
+def _(n, rng):
+    return _memory_benchmark(n, rng, library.Book, library.EBook)
+
+
+@benchmark("memory.books_dict")
+def _(n, rng):
+    return _memory_benchmark(n, rng, DictBook, DictEBook)
+
+
+@benchmark("memory.book_table")
+def _(n, rng):
+    lines = _memory_rows(n, rng)
+
+    def run():
+        table = library.BookTable()
+        for row in map(_split_row, lines):
+            table.append_row(*row)
+        return table
+    return run
+
+
+@benchmark("library.find_by_isbn")
+def _(n, rng):
+    catalog = library.Library()
+    books = make_catalog(n, rng)
+    for book in books:
+        catalog.add_book(book)
+    isbns = [book.isbn for book in rng.sample(books, min(n, 1000))]
+    return lambda: [catalog.find_by_isbn(isbn) for isbn in isbns]
+
+
+@benchmark("library.find_by_title_prefix")
+def _(n, rng):
+    catalog = library.Library()
+    for book in make_catalog(n, rng):
+        catalog.add_book(book)
+    return lambda: [catalog.find_by_title_prefix(word[:3]) for word in WORDS]
+
+
+# Query latency is 1 / ops/s (python benchmarks.py --scale 1m --only library.search for 1M titles)
+@benchmark("library.search")
+def _(n, rng):
+    catalog = library.Library()
+    catalog.add_books(make_catalog(n, rng))
+    queries = [(" ".join(rng.sample(WORDS, rng.randint(1, 2))), False, False) for _ in range(30)]
+    queries += [(word[:3], True, False) for word in rng.sample(WORDS, 10)]
+    queries += [(query, False, True) for query in ("rivr", "gardn", "fortres", "مدن", "الايام")]
+    queries += [("glass storm", True, True), ("naguib", False, False), ("le guin", False, False)]
+
+    def run():
+        for query, prefix, fuzzy in queries:
+            catalog.search(query, prefix=prefix, fuzzy=fuzzy)
+    run.operations = len(queries)
+    return run
+
+
+# Filtered pages: the first page of each listing and the page after its last book (empty, but it
+# has to find the end of the listing). With per-filter indexes neither walks the whole catalog.
+@benchmark("library.page_books_filtered")
+def _(n, rng):
+    catalog = library.Library()
+    books = make_catalog(n, rng)
+    catalog.add_books(books)
+    filters = ([{"author": author, "order_by": "author"} for author in rng.sample(AUTHORS, 3)] +
+               [{"author": author} for author in rng.sample(AUTHORS, 3)] +
+               [{"category": category} for category in rng.sample(CATEGORIES, 3)] +
+               [{"kind": "EBook", "order_by": "author"}, {"kind": "Book", "category": rng.choice(CATEGORIES)}])
+    pages = []
+    for options in filters:
+        order_by = options.get("order_by", "title")
+        last = max(catalog.iter_books(**options), key=lambda book: library.Library.sort_key(book, order_by))
+        pages.append((options, library.Library.sort_key(last, order_by)))
+
+    def run():
+        for options, last in pages:
+            list(itertools.islice(catalog.iter_books(**options), 50))
+            list(catalog.iter_books(after=last, **options))
+    run.operations = 2 * len(pages)
+    return run
+
+
+@benchmark("library.list_books")
+def _(n, rng):
+    books = make_catalog(n, rng)
+    return lambda: library.ReportRenderer(io.StringIO()).write(books)
+
+
+# The same catalog (same n and seed) written to os.devnull three ways: the original
+# print(book.get_details()) loop, ReportRenderer.write and ReportRenderer.write_parallel
+def _report_benchmark(n, rng, write):
+    books = make_catalog(n, rng)
+    sink = open(os.devnull, "w", encoding="utf-8")
+    CLEANUP.append(sink.close)
+
+    def run():
+        write(books, sink)
+    run.operations = n
+    return run
+
+
+def _print_loop(books, sink):
+    for book in books:
+        print(book.get_details(), file=sink)
+
+
+@benchmark("report.print_loop")
+def _(n, rng):
+    return _report_benchmark(n, rng, _print_loop)
+
+
+@benchmark("report.write")
+def _(n, rng):
+    return _report_benchmark(n, rng, lambda books, sink: library.ReportRenderer(sink).write(books))
+
+
+@benchmark("report.write_parallel")
+def _(n, rng):
+    shard_size = max(n // (2 * (os.cpu_count() or 1)), 1000)
+    return _report_benchmark(
+        n, rng, lambda books, sink: library.ReportRenderer(sink).write_parallel(books, shard_size=shard_size))
+
+
+# Rendering hot titles: accesses follow a Zipf distribution (a few titles get most requests)
+def _zipf_renders(n, rng, cache_size):
+    books = make_catalog(max(n // 10, 1), rng)
+    weights = [1 / rank ** 1.1 for rank in range(1, len(books) + 1)]
+    accesses = rng.choices(books, weights, k=n)
+
+    def run():
+        previous = library.Item.render_cache
+        library.Item.render_cache = library.RenderCache(cache_size) if cache_size else None
+        try:
+            for book in accesses:
+                book.get_details()
+                str(book)
+        finally:
+            library.Item.render_cache = previous
+    run.operations = 2 * n
+    return run
+
+
+@benchmark("render.zipf_uncached")
+def _(n, rng):
+    return _zipf_renders(n, rng, cache_size=0)
+
+
+@benchmark("render.zipf_cached")
+def _(n, rng):
+    return _zipf_renders(n, rng, cache_size=max(n // 100, 10))
+
+
+@benchmark("library.snapshot_roundtrip")
+def _(n, rng):
+    books = make_catalog(n, rng)
+    branches = make_branches(max(n // 100, 1), books, 2, rng)
+    path = os.path.join(scratch_dir(), "catalog.libs")
+
+    def run():
+        library.LibrarySnapshot.write(path, books, branches)
+        with library.LibrarySnapshot(path) as snapshot:
+            for index in range(0, len(snapshot), 97):
+                snapshot[index]
+    return run
+
+
+# Startup from a snapshot against rebuilding the catalog from rows in memory. Each pair does
+# the same work: *_load builds every book and index, *_find_by_isbn answers the same 20 lookups.
+def _snapshot_file(n, rng):
+    books = make_catalog(n, rng)
+    path = os.path.join(scratch_dir(), "catalog.libs")
+    library.LibrarySnapshot.write(path, books, [])
+    return books, path
+
+
+def _rebuild(fields):
+    catalog = library.Library()
+    catalog.add_books(library.Book(*row[:4]) if row[4] is None else library.EBook(*row) for row in fields)
+    return catalog
+
+
+def _rebuild_benchmark(n, rng, lookup):
+    books = make_catalog(n, rng)
+    fields = [(book.title, book.author, book.isbn, book.category, getattr(book, "file_size", None))
+              for book in books]
+    isbns = [book.isbn for book in rng.sample(books, min(n, 20))]
+
+    def run():
+        catalog = _rebuild(fields)
+        if lookup:
+            [catalog.find_by_isbn(isbn) for isbn in isbns]
+    return run
+
+
+@benchmark("library.snapshot_load")
+def _(n, rng):
+    _, path = _snapshot_file(n, rng)
+    return lambda: library.Library().load_snapshot(path)
+
+
+@benchmark("library.catalog_rebuild")
+def _(n, rng):
+    return _rebuild_benchmark(n, rng, lookup=False)
+
+
+@benchmark("library.snapshot_find_by_isbn")
+def _(n, rng):
+    books, path = _snapshot_file(n, rng)
+    isbns = [book.isbn for book in rng.sample(books, min(n, 20))]
+
+    def run():
+        with library.Library.open_snapshot(path) as snapshot:
+            [snapshot.find_by_isbn(isbn) for isbn in isbns]
+    return run
+
+
+@benchmark("library.rebuild_find_by_isbn")
+def _(n, rng):
+    return _rebuild_benchmark(n, rng, lookup=True)
+
+
+@benchmark("library.import_catalog")
+def _(n, rng):
+    path = os.path.join(scratch_dir(), "catalog.csv")
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(library.BOOK_FIELDS)
+        writer.writerows(library.book_record(book).values() for book in make_catalog(n, rng))
+    return lambda: library.import_catalog(path, library.Library(), chunk_size=max(n // 8, 1), processes=2)
+
+
+# The same workload on 1..N worker processes (powers of two up to the number of cores)
+def _sharded_benchmark(shards):
+    def setup(n, rng):
+        books = make_catalog(n, rng)
+        copies = {f"Branch {i}": rng.sample(books, min(n, 20)) for i in range(max(n // 100, shards))}
+        queries = [rng.choice(books).isbn for _ in range(200)]
+        sharded = library.ShardedLibrary(shards)
+        CLEANUP.append(sharded.close)
+        for name in copies:
+            sharded.add_branch(name, "District")
+
+        def run():
+            sharded.add_books(books)
+            for name, group in copies.items():
+                sharded.add_copies(name, group)
+            sharded.total_books()
+            sharded.list_books()
+            for isbn in queries:
+                sharded.availability(isbn)
+        return run
+    return setup
+
+
+for _shards in sorted({1, 2, 4, 8, 16, os.cpu_count() or 1}):
+    if _shards <= (os.cpu_count() or 1):
+        benchmark(f"sharded.cores_{_shards}")(_sharded_benchmark(_shards))
+
+
+@benchmark("branch.borrow_return")
+def _(n, rng):
+    books = make_catalog(max(n // 10, 1), rng)
+    branch = make_branches(1, books, 3, rng)[0]
+    customers = make_customers(max(n // 100, 1))
+    loans = [(rng.choice(customers), rng.choice(books)) for _ in range(n)]
+
+    def run():
+        for customer, book in loans:
+            if customer.borrow_book(book, branch):
+                customer.return_book(book, branch)
+    return run
+
+
+def _invoice_rows(n, rng):
+    loan_counts = [rng.randint(0, 5) for _ in range(n)]
+    overdue_days = [rng.randint(0, 30) for _ in range(n)]
+    categories = [rng.choice(CATEGORIES) for _ in range(n)]
+    return loan_counts, overdue_days, categories
+
+
+# Borrow/return traffic from a thread pool against a few shared branches with scarce copies.
+# After the run every copy must be back on its shelf, and no count may have gone negative.
+@benchmark("branch.concurrent_circulation")
+def _(n, rng, threads=8):
+    books = make_catalog(max(n // 100, 10), rng)
+    branches = make_branches(4, books, 2, rng)
+    customers = make_customers(threads * 4)
+    inventory = [Counter(branch.books) for branch in branches]
+    seeds = [rng.random() for _ in range(threads)]
+
+    def worker(index):
+        worker_rng = random.Random(seeds[index])
+        own = customers[index::threads]
+        held = []
+        for _ in range(n // threads):
+            if held and worker_rng.random() < 0.5:
+                customer, book, branch = held.pop(worker_rng.randrange(len(held)))
+                assert customer.return_book(book, branch)
+            else:
+                customer, book, branch = worker_rng.choice(own), worker_rng.choice(books), worker_rng.choice(branches)
+                if customer.borrow_book(book, branch):
+                    held.append((customer, book, branch))
+            assert branch.copies(book) >= 0, f"{branch.name} lent more copies than it has"
+        for customer, book, branch in held:
+            assert customer.return_book(book, branch)
+
+    def run():
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(worker, range(threads)))
+        for branch, expected in zip(branches, inventory):
+            assert branch.books == expected, f"{branch.name} inventory changed"
+        assert not any(customer.borrowed_books for customer in customers), "loans left open"
+    run.operations = n // threads * threads
+    return run
+
+
+@benchmark("billing.generate_invoices")
+def _(n, rng):
+    customer_ids = [f"C{i:07d}" for i in range(n)]
+    loan_counts, overdue_days, categories = _invoice_rows(n, rng)
+    return lambda: library.BillingSystem.generate_invoices(customer_ids, loan_counts, overdue_days, categories)
+
+
+# The same invoices as billing.generate_invoices, one generate_invoice call per customer
+@benchmark("billing.per_customer_loop")
+def _(n, rng):
+    customers = make_customers(n)
+    loan_counts, overdue_days, categories = _invoice_rows(n, rng)
+    loans = [[library.Book("Title", "Author", "0", category)] * count
+             for count, category in zip(loan_counts, categories)]
+
+    def run():
+        for customer, books, days in zip(customers, loans, overdue_days):
+            library.BillingSystem.generate_invoice(customer, books, days)
+    return run
+
+
+def _store_benchmark(n, rng, batch_size):
+    path = os.path.join(scratch_dir(), "circulation.db")
+    operations = [(f"C{rng.randrange(n // 10 + 1):07d}", f"{9780000000000 + rng.randrange(n)}") for _ in range(n)]
+
+    def run():
+        store = library.SQLiteCirculationStore(path, batch_size=batch_size)
+        for customer_id, isbn in operations:
+            store.record_loan(customer_id, isbn, 1)
+            store.record_inventory("Main", isbn, -1)
+        store.close()
+    return run
+
+
+@benchmark("store.sqlite_write_behind")
+def _(n, rng):
+    return _store_benchmark(n, rng, batch_size=1000)
+
+
+@benchmark("store.sqlite_write_per_call")
+def _(n, rng):
+    return _store_benchmark(n, rng, batch_size=1)
+
+
+@benchmark("recommender.recommend")
+def _(n, rng):
+    recommender = library.Recommender(k=20)
+    users = max(n // 10, 1)
+    for _ in range(n):
+        user_id = rng.randrange(users)
+        # a skewed item popularity, so some titles are borrowed by many readers
+        isbn = str(int(rng.paretovariate(1.2)) % max(n // 2, 1))
+        if rng.random() < 0.3:
+            recommender.record_rating(user_id, isbn, rng.randint(1, 5))
+        else:
+            recommender.record_borrow(user_id, isbn)
+    queries = [rng.randrange(users) for _ in range(1000)]
+    return lambda: [recommender.recommend(user_id) for user_id in queries]
+
+
+def _events(n, rng):
+    for i in range(n):
+        isbn = f"{9780000000000 + rng.randrange(1000)}"
+        branch = f"Branch {rng.randrange(20)}"
+        yield rng.choice((
+            library.BookBorrowed(f"C{i % 5000:07d}", isbn, branch, 1_700_000_000.0 + i),
+            library.BookReturned(f"C{i % 5000:07d}", isbn, branch, 1_700_000_000.0 + i),
+            library.FinePaid(f"C{i % 5000:07d}", 1.5, 1_700_000_000.0 + i),
+        ))
+
+
+@benchmark("events.ingest")
+def _(n, rng):
+    events = list(_events(n, rng))
+
+    def run():
+        log = library.EventLog(scratch_dir(), segment_size=1024 * 1024)
+        for view in (library.LoansPerBranch(), library.FinesPerDay(), library.TopTitles()):
+            log.subscribe(view)
+        for event in events:
+            log.append(event)
+        log.close()
+    return run
+
+
+@benchmark("events.replay")
+def _(n, rng):
+    directory = scratch_dir()
+    log = library.EventLog(directory, segment_size=1024 * 1024)
+    for event in _events(n, rng):
+        log.append(event)
+    log.close()
+
+    def run():
+        log = library.EventLog(directory, segment_size=1024 * 1024)
+        log.replay(library.LoansPerBranch(), library.FinesPerDay(), library.TopTitles())
+        log.close()
+    return run
+
+
+# SOLID benchmarks
+
+@benchmark("solid.transaction_manager")
+def _(n, rng):
+    transactions = list(transaction_stream(n, rng))
+
+    def run():
+        manager = solid.TransactionManager()
+        for amount, description, _ in transactions:
+            manager.add_transaction(amount, description)
+            manager.calculate_total()
+    return run
+
+
+@benchmark("solid.transaction_ledger")
+def _(n, rng):
+    transactions = list(transaction_stream(n, rng))
+
+    def run():
+        ledger = solid.TransactionLedger()
+        ledger.extend(transactions)
+        ledger.total_since(3600, now=transactions[-1][2])
+    return run
+
+
+@benchmark("solid.report_printer")
+def _(n, rng):
+    manager = solid.TransactionManager()
+    for amount, description, _ in transaction_stream(n, rng):
+        manager.add_transaction(amount, description)
+    return lambda: solid.ReportPrinter().print_report(manager, io.StringIO())
+
+
+@benchmark("solid.payment_service")
+def _(n, rng):
+    service = solid.PaymentService(SilentPaymentProcessor())
+    amounts = [rng.uniform(1, 100) for _ in range(n)]
+    return lambda: [service.process_payment(amount) for amount in amounts]
+
+
+@benchmark("solid.payment_settlement")
+def _(n, rng):
+    engine = solid.PaymentSettlementEngine({kind: SilentPaymentProcessor() for kind in ("card", "paypal", "bank")})
+    payments = [(rng.choice(("card", "paypal", "bank")), rng.uniform(1, 100)) for _ in range(n)]
+    return lambda: engine.settle(payments)
+
+
+# Startup benchmarks
+
+def _import_time(module, directory):
+    # Cumulative import time (in seconds) of `module` in a fresh interpreter, from -X importtime
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=directory, capture_output=True, text=True, check=True).stderr
+    for line in output.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1_000_000
+    raise RuntimeError(f"no -X importtime entry for {module}")
+
+
+@benchmark("startup.import_library")
+def _(n, rng):
+    return lambda: _import_time("Library", os.path.join(ROOT, "Projects"))
+
+
+# Only the submodule that defines Book (see Projects/__init__.py)
+@benchmark("startup.import_book")
+def _(n, rng):
+    return lambda: _import_time("Projects.items", ROOT)
+
+
+@benchmark("startup.import_solid")
+def _(n, rng):
+    return lambda: _import_time("SOLID", ROOT)
+
+
+# Runner
+
+def measure(setup, n, repeat):
+    try:
+        run = setup(n, random.Random(SEED))
+        timings = []
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                measured = run()
+                elapsed = time.perf_counter() - start
+                timings.append(measured if isinstance(measured, float) else elapsed)
+            # Peak memory is measured on a separate run, since tracing slows the code down
+            run = setup(n, random.Random(SEED))
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        while CLEANUP:
+            CLEANUP.pop()()
+    result = {"seconds": min(timings), "peak_bytes": peak}
+    if getattr(run, "operations", None):
+        result["operations_per_second"] = run.operations / result["seconds"]
+    return result
+
+
+# Peak memory differences below this are noise (interned strings, allocator caches)
+MEMORY_SLACK = 64 * 1024
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append(f"{name}: {previous['seconds']:.4f}s -> {result['seconds']:.4f}s")
+        if (result["peak_bytes"] > previous["peak_bytes"] * (1 + threshold) and
+                result["peak_bytes"] - previous["peak_bytes"] > MEMORY_SLACK):
+            regressions.append(f"{name}: peak {previous['peak_bytes'] / 1024:.1f} KiB -> "
+                               f"{result['peak_bytes'] / 1024:.1f} KiB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="", help="run only benchmarks whose name contains this text")
+    parser.add_argument("--baseline", help="JSON file to compare against")
+    parser.add_argument("--save-baseline", help="JSON file to store the results in")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown or memory growth (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    n = SCALES[args.scale]
+    results = {}
+    print(f"{'benchmark':32} {'time (s)':>10} {'peak (KiB)':>12} {'ops/s':>12}")
+    for name, setup in BENCHMARKS.items():
+        if args.only in name:
+            result = results[name] = measure(setup, n, args.repeat)
+            throughput = f"{result['operations_per_second']:12.0f}" if "operations_per_second" in result else ""
+            print(f"{name:32} {result['seconds']:10.4f} {result['peak_bytes'] / 1024:12.1f} {throughput}".rstrip())
+
+    key = args.scale
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.save_baseline):
+            with open(args.save_baseline, encoding="utf-8") as file:
+                stored = json.load(file)
+        stored.setdefault(key, {}).update(results)
+        with open(args.save_baseline, "w", encoding="utf-8") as file:
+            json.dump(stored, file, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file).get(key, {}), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())